@@ -40,3 +40,18 @@ function request()
   -- Always use GET for simplicity
   return wrk.format("GET", line)
 end
+
+-- Dump latency percentiles (p, microseconds) to $WRK_LATENCY_FILE so callers
+-- can read them directly instead of scraping wrk's text report.
+local percentiles = {50, 75, 90, 99, 99.9, 99.99}
+
+function done(summary, latency, requests)
+  local path = os.getenv("WRK_LATENCY_FILE")
+  if not path then return end
+  local f = io.open(path, "w")
+  if not f then return end
+  for _, p in ipairs(percentiles) do
+    f:write(string.format("%g,%d\n", p, latency:percentile(p)))
+  end
+  f:close()
+end
@@ -0,0 +1,318 @@
+"""Shared deploy / health-check / cleanup helpers for the kv-store latency drivers."""
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import yaml
+from kubernetes import client as k8s_client, config as k8s_config, utils as k8s_utils, watch as k8s_watch
+from kubernetes.client.rest import ApiException
+
+from _wrk import APP_URL, HEALTH_CHECK_PROBES, SESSION
+
+logger = logging.getLogger(__name__)
+
+# libyaml-backed loader when PyYAML was built with it, else the pure-Python one
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Shared Kubernetes API client: kubeconfig is loaded and the TLS session set up once
+k8s_config.load_kube_config()
+K8S_API = k8s_client.ApiClient()
+APPS_V1 = k8s_client.AppsV1Api(K8S_API)
+CORE_V1 = k8s_client.CoreV1Api(K8S_API)
+NAMESPACE = "default"
+
+def check_manifests_exist(manifest_dict):
+    """Exit if any manifest is missing (one directory listing per manifest directory)."""
+    present_manifests = set()
+    for manifest_dir in {os.path.dirname(p) for p in manifest_dict.values()}:
+        if os.path.isdir(manifest_dir):
+            with os.scandir(manifest_dir) as entries:
+                present_manifests.update(os.path.join(manifest_dir, e.name) for e in entries)
+    for manifest_path in manifest_dict.values():
+        if manifest_path not in present_manifests:
+            logger.error(f"Manifest {manifest_path} does not exist")
+            sys.exit(1)
+        logger.info(f"Manifest {manifest_path} exists")
+
+def deploy_manifest(manifest_path):
+    """Deploy the Kubernetes manifest file."""
+    logger.info(f"Deploying manifest: {manifest_path}")
+    try:
+        k8s_utils.create_from_yaml(K8S_API, manifest_path, namespace=NAMESPACE)
+    except k8s_utils.FailToCreateError as e:
+        logger.error(f"Error deploying manifest: {e}")
+        return False
+    logger.info(f"Successfully deployed: {manifest_path}")
+    return True
+
+def wait_for_deployment_ready(timeout=120):
+    """Wait for all deployments to be ready."""
+    logger.info("Waiting for deployments to be ready...")
+    # Readiness is pushed as watch events instead of being polled
+    deployments = {}
+    w = k8s_watch.Watch()
+    for event in w.stream(APPS_V1.list_namespaced_deployment, namespace=NAMESPACE, timeout_seconds=timeout):
+        deployment = event["object"]
+        if event["type"] == "DELETED":
+            deployments.pop(deployment.metadata.name, None)
+        else:
+            status = deployment.status
+            deployments[deployment.metadata.name] = (status.ready_replicas or 0, status.replicas or 0)
+        if deployments and all(replicas > 0 and ready >= replicas for ready, replicas in deployments.values()):
+            w.stop()
+            logger.info("All deployments are ready!")
+            return True
+
+    logger.warning("Timeout waiting for deployments to be ready")
+    return False
+
+def probe_application(url, timeout_duration):
+    """Send a single health check request and report whether it succeeded."""
+    try:
+        response = SESSION.get(url, timeout=timeout_duration)
+        if response.status_code == 200:
+            return True
+        logger.warning(f"Health check request failed with status code {response.status_code}")
+    except requests.Timeout:
+        logger.warning("Health check request timed out!")
+    except Exception as e:
+        logger.warning(f"Health check request error: {e}")
+    return False
+
+def test_application(num_requests=HEALTH_CHECK_PROBES, timeout_duration=1):
+    """Test if the application is healthy by making concurrent HTTP requests."""
+    url = APP_URL
+
+    # Probes are independent, so issue them all at once
+    with ThreadPoolExecutor(max_workers=num_requests) as executor:
+        successful_requests = sum(executor.map(lambda _: probe_application(url, timeout_duration), range(num_requests)))
+
+    # Consider healthy if at least 80% of requests succeed
+    is_healthy = successful_requests >= (num_requests * 0.8)
+    if is_healthy:
+        logger.info(f"Application is healthy ({successful_requests}/{num_requests} requests succeeded)")
+    else:
+        logger.warning(f"Application may be unhealthy ({successful_requests}/{num_requests} requests succeeded)")
+    return is_healthy
+
+def cleanup_all_resources():
+    """Delete all Kubernetes resources in the current namespace."""
+    logger.info(f"Cleaning up all deployments, services and pods in namespace '{NAMESPACE}'...")
+    try:
+        APPS_V1.delete_collection_namespaced_deployment(NAMESPACE, propagation_policy="Foreground")
+        for service in CORE_V1.list_namespaced_service(NAMESPACE).items:
+            # The apiserver's own service is recreated immediately, so leave it alone
+            if service.metadata.name != "kubernetes":
+                CORE_V1.delete_namespaced_service(service.metadata.name, NAMESPACE)
+        CORE_V1.delete_collection_namespaced_pod(NAMESPACE)
+    except ApiException as e:
+        logger.warning(f"Error cleaning up resources: {e}")
+    else:
+        logger.info("Successfully cleaned up all resources")
+    wait_for_all_deleted()
+
+def wait_for_deleted(list_fn, kind, names=None, timeout=30, keep=()):
+    """Block until the listed objects (all but `keep`, or just `names`) are gone, watching deletions.
+
+    `list_fn` is a namespaced list call such as CORE_V1.list_namespaced_pod.
+    """
+    listing = list_fn(NAMESPACE)
+    remaining = {obj.metadata.name for obj in listing.items} - set(keep)
+    if names is not None:
+        remaining &= set(names)
+    if not remaining:
+        return True
+    w = k8s_watch.Watch()
+    for event in w.stream(list_fn, namespace=NAMESPACE,
+                          resource_version=listing.metadata.resource_version, timeout_seconds=timeout):
+        name = event["object"].metadata.name
+        if event["type"] == "DELETED":
+            remaining.discard(name)
+        elif name not in keep and (names is None or name in names):
+            remaining.add(name)
+        if not remaining:
+            w.stop()
+            return True
+    logger.warning(f"{kind} still present after {timeout}s: {', '.join(sorted(remaining))}")
+    return False
+
+def wait_for_pods_deleted(timeout=30):
+    """Block until no pods remain in the namespace, watching deletions instead of sleeping."""
+    return wait_for_deleted(CORE_V1.list_namespaced_pod, "Pods", timeout=timeout)
+
+def wait_for_all_deleted(timeout=30):
+    """Block until no pods, Deployments or (non-apiserver) Services remain in the namespace.
+
+    Foreground deletion removes a Deployment only after its pods, so the pods going away
+    is not enough: a Deployment still holding its finalizer would make the next create 409.
+    """
+    pods_gone = wait_for_pods_deleted(timeout)
+    deployments_gone = wait_for_deleted(APPS_V1.list_namespaced_deployment, "Deployments", timeout=timeout)
+    services_gone = wait_for_deleted(CORE_V1.list_namespaced_service, "Services", timeout=timeout,
+                                     keep=("kubernetes",))
+    return pods_gone and deployments_gone and services_gone
+
+def cleanup_manifest(manifest_path):
+    """Delete the Kubernetes manifest and wait for its objects to be gone."""
+    logger.info(f"Cleaning up manifest: {manifest_path}")
+    with open(manifest_path, "r") as f:
+        docs = [doc for doc in yaml.load_all(f, Loader=YAML_LOADER) if doc]
+    deployments, services = [], []
+    for doc in docs:
+        name = doc["metadata"]["name"]
+        namespace = doc["metadata"].get("namespace", NAMESPACE)
+        try:
+            if doc["kind"] == "Deployment":
+                APPS_V1.delete_namespaced_deployment(name, namespace, propagation_policy="Foreground")
+                deployments.append(name)
+            elif doc["kind"] == "Service":
+                CORE_V1.delete_namespaced_service(name, namespace)
+                services.append(name)
+        except ApiException as e:
+            # Already gone is fine; anything else is worth a warning but not worth stopping for
+            if e.status != 404:
+                logger.warning(f"Error cleaning up {doc['kind']} {name}: {e}")
+    # Watch the deletions through instead of sleeping a fixed amount
+    wait_for_pods_deleted()
+    wait_for_deleted(APPS_V1.list_namespaced_deployment, "Deployments", names=deployments)
+    wait_for_deleted(CORE_V1.list_namespaced_service, "Services", names=services)
+    logger.info(f"Successfully cleaned up: {manifest_path}")
+
+def serializable_result(result):
+    """Copy a result with its float percentile keys formatted back as "50", "99.9", ..."""
+    result = dict(result)
+    if "latency_metrics" in result:
+        result["latency_metrics"] = {f"{p:g}": v for p, v in sorted(result["latency_metrics"].items())}
+    return result
+
+def run_benchmarks(manifest_dict, run_wrk, progress_filename):
+    """Deploy, health-check, benchmark and tear down each manifest in turn; return per-manifest results.
+
+    Each result is also appended to `progress_filename` as a JSON line as soon as it is known,
+    so a crash mid-sweep keeps the manifests that already finished.
+    """
+    # Store results for all manifests
+    results = {}
+    progress_file = open(progress_filename, "a", buffering=1)
+
+    def record(manifest_name, result):
+        results[manifest_name] = result
+        progress_file.write(json.dumps({"name": manifest_name, **serializable_result(result)}) + "\n")
+        progress_file.flush()
+        os.fsync(progress_file.fileno())
+
+    # Log script start
+    logger.info("=" * 60)
+    logger.info("Starting KV Store Benchmark Suite")
+    logger.info(f"Testing {len(manifest_dict)} manifest configurations")
+    logger.info("=" * 60)
+    logger.info("")
+
+    # Iterate over each manifest
+    for manifest_name, manifest_path in manifest_dict.items():
+        logger.info("")
+        logger.info("=" * 60)
+        logger.info(f"Testing: {manifest_name}")
+        logger.info("=" * 60)
+        logger.info("")
+
+        # Step 0: Clean up all existing resources, including the previous manifest's
+        cleanup_all_resources()
+
+        # Step 1: Deploy the manifest
+        if not deploy_manifest(manifest_path):
+            logger.error(f"Failed to deploy {manifest_name}, skipping...")
+            record(manifest_name, {"status": "deployment_failed"})
+            continue
+
+        # Step 2: Wait for deployment to be ready
+        if not wait_for_deployment_ready():
+            logger.warning(f"Deployment for {manifest_name} did not become ready, skipping...")
+            record(manifest_name, {"status": "not_ready"})
+            continue
+
+        # Step 3: Test application health
+        if not test_application():
+            logger.warning(f"Application {manifest_name} is not healthy, skipping benchmark...")
+            record(manifest_name, {"status": "unhealthy"})
+            continue
+
+        # Step 4: Run wrk and collect latency
+        wrk_result = run_wrk(manifest_name)
+
+        # Step 5: Store results
+        if wrk_result is None:
+            record(manifest_name, {
+                "status": "wrk_failed"
+            })
+        elif wrk_result.get("error_count", 0) > 0:
+            # If there are non-2xx or 3xx responses, set status to failure
+            logger.error(f"Benchmark failed: {wrk_result['error_count']} non-2xx or 3xx responses detected")
+            record(manifest_name, {
+                "status": "failure",
+                "latency_metrics": wrk_result.get("latency_metrics", {}),
+                "error_count": wrk_result.get("error_count", 0),
+                "requests_per_sec": wrk_result.get("requests_per_sec"),
+            })
+        else:
+            record(manifest_name, {
+                "status": "success",
+                "latency_metrics": wrk_result.get("latency_metrics", {}),
+                "error_count": wrk_result.get("error_count", 0),
+                "requests_per_sec": wrk_result.get("requests_per_sec"),
+            })
+
+    # The next iteration's cleanup_all_resources tears each manifest down; only the
+    # last one is left running, so remove it here
+    if manifest_dict:
+        cleanup_manifest(next(reversed(manifest_dict.values())))
+    progress_file.close()
+    return results
+
+def log_summary(results):
+    """Log the summary of results for every manifest."""
+    logger.info("")
+    logger.info("=" * 60)
+    logger.info("SUMMARY OF RESULTS")
+    logger.info("=" * 60)
+    logger.info("")
+    for manifest_name, result in results.items():
+        logger.info(f"{manifest_name}:")
+        status = result.get("status")
+        if status == "success":
+            latency = result.get("latency_metrics", {})
+            requests_per_sec = result.get("requests_per_sec")
+            if requests_per_sec is not None:
+                logger.info(f"  Requests/sec: {requests_per_sec:.2f}")
+            if latency:
+                logger.info(f"  Latency metrics:")
+                # Percentile keys are floats, so the natural order is numeric
+                for p, latency_ms in sorted(latency.items()):
+                    logger.info(f"    {p:g}%: {latency_ms:.2f}ms")
+            logger.info(f"  Status: {status}")
+        elif status == "failure":
+            latency = result.get("latency_metrics", {})
+            error_count = result.get("error_count", 0)
+            requests_per_sec = result.get("requests_per_sec")
+            logger.error(f"  Status: {status}")
+            logger.error(f"  Non-2xx or 3xx responses: {error_count}")
+            if requests_per_sec is not None:
+                logger.info(f"  Requests/sec: {requests_per_sec:.2f}")
+            if latency:
+                logger.info(f"  Latency metrics:")
+                # Percentile keys are floats, so the natural order is numeric
+                for p, latency_ms in sorted(latency.items()):
+                    logger.info(f"    {p:g}%: {latency_ms:.2f}ms")
+        else:
+            logger.info(f"  Status: {status}")
+        logger.info("")
+
+def save_results(results, results_filename):
+    """Write results as JSON, formatting percentile keys back as "50", "99.9", ..."""
+    serializable = {name: serializable_result(result) for name, result in results.items()}
+    with open(results_filename, "w") as f:
+        json.dump(serializable, f, indent=2)
+    logger.info(f"Results saved to {results_filename}")
@@ -0,0 +1,102 @@
+"""wrk output parsing and warmup helpers shared by the latency drivers.
+
+Kept free of Kubernetes imports so drivers that manage the cluster with kubectl can use it too.
+"""
+import csv
+import logging
+import os
+import re
+import time
+from datetime import datetime
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Timestamp shared by every file written during this run
+RUN_TS = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+# wrk output patterns, e.g. "    50%   49.00us" and "Non-2xx or 3xx responses: 3"
+_PCTL_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)%\s+(\d+(?:\.\d+)?)(us|ms|s)\b')
+_ERR_RE = re.compile(r'Non-2xx or 3xx responses:\s*(\d+)')
+_RPS_RE = re.compile(r'Requests/sec:\s*(\d+(?:\.\d+)?)')
+_UNIT_TO_MS = {'us': 1e-3, 'ms': 1.0, 's': 1e3}
+
+# Request used for health checks and warmup
+APP_URL = "http://10.96.88.88:80/?op=SET&key=82131353f9ddc8c6&key_size=48&value_size=87"
+
+# Reuse keep-alive HTTP connections for health checks (one per concurrent probe)
+HEALTH_CHECK_PROBES = 10
+SESSION = requests.Session()
+SESSION.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=HEALTH_CHECK_PROBES))
+
+def wait_until_serving(url, max_s=30, required_hits=3):
+    """Wait until `required_hits` consecutive requests succeed, up to `max_s` seconds."""
+    start_time = time.time()
+    hits = 0
+    while time.time() - start_time < max_s:
+        try:
+            SESSION.get(url, timeout=0.5).raise_for_status()
+            hits += 1
+        except requests.RequestException:
+            hits = 0
+        if hits >= required_hits:
+            logger.info(f"Application is serving after {time.time() - start_time:.2f}s")
+            return True
+        time.sleep(0.1)
+    logger.warning(f"Application was not serving consistently after {max_s}s")
+    return False
+
+def new_wrk_stats():
+    """Return an empty wrk result: latencies in ms keyed by float percentile."""
+    return {
+        "latency_metrics": {},
+        "error_count": 0,
+        "requests_per_sec": None
+    }
+
+def parse_wrk_line(line, stats):
+    """Fold one line of wrk output into stats."""
+    m = _PCTL_RE.match(line)
+    if m:
+        stats["latency_metrics"][float(m.group(1))] = float(m.group(2)) * _UNIT_TO_MS[m.group(3)]
+        return
+
+    # Check for requests per second
+    m = _RPS_RE.search(line)
+    if m:
+        stats["requests_per_sec"] = float(m.group(1))
+        logger.info(f"Found requests/sec: {stats['requests_per_sec']}")
+        return
+
+    # Check for non-2xx or 3xx responses
+    m = _ERR_RE.search(line)
+    if m:
+        stats["error_count"] = int(m.group(1))
+        logger.info(f"Found {stats['error_count']} non-2xx or 3xx responses")
+
+def wrk_env(latency_file):
+    """Environment for wrk that makes kvstore-wrk.lua's done() hook dump percentiles to latency_file."""
+    if os.path.exists(latency_file):
+        os.remove(latency_file)
+    return dict(os.environ, WRK_LATENCY_FILE=os.path.abspath(latency_file))
+
+def load_latency_file(latency_file, stats):
+    """Take percentiles from the done() dump (percentile, microseconds) when wrk wrote one."""
+    if not os.path.exists(latency_file):
+        return
+    with open(latency_file, "r", newline="") as f:
+        latency_metrics = {float(p): int(us) / 1000 for p, us in csv.reader(f)}
+    if latency_metrics:
+        stats["latency_metrics"] = latency_metrics
+
+def log_wrk_stats(application_name, stats):
+    """Log the percentiles and throughput collected for one run."""
+    latency_metrics = stats["latency_metrics"]
+    logger.debug(f"Raw latency metrics: {latency_metrics}")
+    if latency_metrics:
+        logger.info(f"Latency metrics for {application_name}:")
+        for p, latency_ms in sorted(latency_metrics.items()):
+            logger.info(f"  {p:g}%: {latency_ms:.2f}ms")
+    if stats["requests_per_sec"] is not None:
+        logger.info(f"Requests/sec: {stats['requests_per_sec']:.2f}")
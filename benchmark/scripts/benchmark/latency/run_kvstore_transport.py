@@ -7,6 +7,10 @@ import os
 import argparse
 from datetime import datetime
 
+from _wrk import (
+    APP_URL, load_latency_file, log_wrk_stats, new_wrk_stats, parse_wrk_line, wait_until_serving, wrk_env,
+)
+
 # Create logs directory if it doesn't exist
 log_dir = "logs"
 os.makedirs(log_dir, exist_ok=True)
@@ -32,22 +36,21 @@ ARPC_DIR = "/users/xzhu/arpc"
 wrk_path = os.path.join(ARPC_DIR, "benchmark/scripts/wrk/wrk")
 lua_path = os.path.join(ARPC_DIR, "benchmark/meta-kv-trace/kvstore-wrk.lua")
 
+# Percentile dump written by the Lua script's done() hook (percentile, microseconds)
+latency_file = os.path.join(log_dir, "wrk_latency.csv")
+
 # All available transport variants
 # ALL_VARIANTS = ["udp", "reliable", "cc", "reliable-cc", "fc", "cc-fc", "reliable-fc", "reliable-cc-fc", "reliable-cc-fc-encryption", "quic"]
 ALL_VARIANTS = ["udp", "reliable", "reliable-cc", "reliable-cc-fc", "reliable-cc-fc-encryption", "quic"]
 
 # Manifest paths for each variant
+MANIFEST_TEMPLATE = os.path.join(ARPC_DIR, "benchmark/kv-store-symphony-transport/manifest/kvstore-{}.yaml")
+MANIFEST_OVERRIDES = {
+    "quic": os.path.join(ARPC_DIR, "benchmark/scripts/manifest-arpc/kv-store-arpc-quic.yaml"),
+}
 manifest_dict = {
-    "kv-store-symphony-transport-udp": os.path.join(ARPC_DIR, "benchmark/kv-store-symphony-transport/manifest/kvstore-udp.yaml"),
-    "kv-store-symphony-transport-reliable": os.path.join(ARPC_DIR, "benchmark/kv-store-symphony-transport/manifest/kvstore-reliable.yaml"),
-    "kv-store-symphony-transport-cc": os.path.join(ARPC_DIR, "benchmark/kv-store-symphony-transport/manifest/kvstore-cc.yaml"),
-    "kv-store-symphony-transport-reliable-cc": os.path.join(ARPC_DIR, "benchmark/kv-store-symphony-transport/manifest/kvstore-reliable-cc.yaml"),
-    "kv-store-symphony-transport-fc": os.path.join(ARPC_DIR, "benchmark/kv-store-symphony-transport/manifest/kvstore-fc.yaml"),
-    "kv-store-symphony-transport-cc-fc": os.path.join(ARPC_DIR, "benchmark/kv-store-symphony-transport/manifest/kvstore-cc-fc.yaml"),
-    "kv-store-symphony-transport-reliable-fc": os.path.join(ARPC_DIR, "benchmark/kv-store-symphony-transport/manifest/kvstore-reliable-fc.yaml"),
-    "kv-store-symphony-transport-reliable-cc-fc": os.path.join(ARPC_DIR, "benchmark/kv-store-symphony-transport/manifest/kvstore-reliable-cc-fc.yaml"),
-    "kv-store-symphony-transport-reliable-cc-fc-encryption": os.path.join(ARPC_DIR, "benchmark/kv-store-symphony-transport/manifest/kvstore-reliable-cc-fc-encryption.yaml"),
-    "kv-store-symphony-transport-quic": os.path.join(ARPC_DIR, "benchmark/scripts/manifest-arpc/kv-store-arpc-quic.yaml"),
+    f"kv-store-symphony-transport-{v}": MANIFEST_OVERRIDES.get(v, MANIFEST_TEMPLATE.format(v))
+    for v in ALL_VARIANTS
 }
 
 def validate_paths(selected_manifests):
@@ -109,10 +112,12 @@ Examples:
     return parser.parse_args()
 
 def deploy_manifest(manifest_path):
-    """Deploy the Kubernetes manifest file."""
+    """Deploy the manifest, pruning benchmark=yes resources left over from the previous one."""
     logger.info(f"Deploying manifest: {manifest_path}")
+    # One kubectl call replaces the old delete-all + apply pair; --wait covers the pruned objects
     result = subprocess.run(
-        ["kubectl", "apply", "-f", manifest_path],
+        ["kubectl", "apply", "--prune", "-l", "benchmark=yes", "-f", manifest_path,
+         "--wait=true", "--timeout=120s"],
         capture_output=True,
         text=True
     )
@@ -128,8 +133,13 @@ def wait_for_deployment_ready(timeout=120):
     start_time = time.time()
     while time.time() - start_time < timeout:
         # Check if all deployments are ready
+        # Project just "generation/observed/updated/ready/replicas" per deployment instead of parsing
+        # the full JSON objects. apply updates same-named deployments in place, so the controller
+        # must have seen the new spec (observedGeneration) and rolled the old pods out too
         result = subprocess.run(
-            ["kubectl", "get", "deployments", "-o", "json"],
+            ["kubectl", "get", "deployments", "-o",
+             "jsonpath={range .items[*]}{.metadata.generation}/{.status.observedGeneration}/"
+             "{.status.updatedReplicas}/{.status.readyReplicas}/{.status.replicas} {end}"],
             capture_output=True,
             text=True
         )
@@ -137,22 +147,12 @@ def wait_for_deployment_ready(timeout=120):
             logger.error(f"Error checking deployments: {result.stderr}")
             return False
         
-        try:
-            deployments = json.loads(result.stdout)
-            all_ready = True
-            for item in deployments.get("items", []):
-                status = item.get("status", {})
-                ready_replicas = status.get("readyReplicas", 0)
-                replicas = status.get("replicas", 0)
-                if ready_replicas < replicas or replicas == 0:
-                    all_ready = False
-                    break
-            
-            if all_ready and len(deployments.get("items", [])) > 0:
-                logger.info("All deployments are ready!")
-                return True
-        except json.JSONDecodeError:
-            pass
+        counts = [p.split("/") for p in result.stdout.split()]
+        if counts and all(generation == observed and updated == ready == replicas
+                          and replicas not in ("", "0")
+                          for generation, observed, updated, ready, replicas in counts):
+            logger.info("All deployments are ready!")
+            return True
         
         time.sleep(2)
     
@@ -161,7 +161,7 @@ def wait_for_deployment_ready(timeout=120):
 
 def test_application(num_requests=10, timeout_duration=1):
     """Test if the application is healthy by making curl requests."""
-    url = "http://10.96.88.88:80/?op=SET&key=82131353f9ddc8c6&key_size=48&value_size=87"
+    url = APP_URL
     successful_requests = 0
 
     for _ in range(num_requests):
@@ -192,105 +192,48 @@ def test_application(num_requests=10, timeout_duration=1):
 
 def run_wrk_and_collect_latency(application_name):
     """Run wrk benchmark and collect latency metrics."""
-    time.sleep(15)
+    # Short bound: a variant that never settles is still measured, as before
+    wait_until_serving(APP_URL, max_s=5)
     
     logger.info(f"Running wrk for {application_name}")
     
     # Run wrk for latency test
     cmd = [wrk_path, "-d", "60s", "-t", "1", "-c", "1", "http://10.96.88.88:80", "-s", lua_path, "-L"]
     print(" ".join(cmd))
-    result = subprocess.run(
-        " ".join(cmd),
-        shell=True,
+    proc = subprocess.Popen(
+        cmd,
+        env=wrk_env(latency_file),
         stdin=subprocess.DEVNULL,
         stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1
     )
     
-    if result.returncode != 0:
-        logger.error(f"Error running wrk: {result.stderr.decode('utf-8')}")
+    # Parse wrk output line by line as it is emitted (latencies converted to milliseconds)
+    stats = new_wrk_stats()
+    for line in proc.stdout:
+        sys.stdout.write(line)
+        parse_wrk_line(line, stats)
+    
+    stderr = proc.stderr.read()
+    if proc.wait() != 0:
+        logger.error(f"Error running wrk: {stderr}")
         return None
-    print(result.stdout.decode("utf-8"))
-    output_lines = result.stdout.decode("utf-8").split('\n')
     
-    # Extract latency metrics
-    latency_metrics = {}
-    error_count = 0
-    requests_per_sec = None
-    for line in output_lines:
-        # Check for requests per second
-        if "Requests/sec:" in line:
-            try:
-                # Extract the number after the colon
-                parts = line.split("Requests/sec:")
-                if len(parts) == 2:
-                    requests_per_sec = float(parts[1].strip())
-                    logger.info(f"Found requests/sec: {requests_per_sec}")
-            except (ValueError, IndexError):
-                logger.warning(f"Could not parse requests/sec from line: {line}")
-        
-        # Check for non-2xx or 3xx responses
-        if "Non-2xx or 3xx responses:" in line:
-            try:
-                # Extract the number after the colon
-                parts = line.split("Non-2xx or 3xx responses:")
-                if len(parts) == 2:
-                    error_count = int(parts[1].strip())
-                    logger.info(f"Found {error_count} non-2xx or 3xx responses")
-            except (ValueError, IndexError):
-                logger.warning(f"Could not parse error count from line: {line}")
-        
-        # Look for percentile latencies (50%, 75%, 90%, 99%, etc.)
-        # Format: "    50%   49.00us" - first token ends with %, second is latency
-        parts = line.strip().split()
-        if len(parts) >= 2 and parts[0].endswith('%'):
-            try:
-                percentile = parts[0].rstrip('%')
-                latency_str = parts[1]
-                
-                # Verify latency_str has a valid unit
-                if not (latency_str.endswith('us') or latency_str.endswith('ms') or latency_str.endswith('s')):
-                    continue
-                
-                # Extract number and unit
-                latency_value = float(latency_str.rstrip('us').rstrip('s').rstrip('ms'))
-                unit = latency_str[-2:] if len(latency_str) >= 2 else 'ms'
-                
-                # Convert to milliseconds
-                if unit == 'us':
-                    latency_ms = latency_value / 1000
-                elif unit == 's':
-                    latency_ms = latency_value * 1000
-                else:  # already ms
-                    latency_ms = latency_value
-                
-                latency_metrics[percentile] = latency_ms
-            except (ValueError, IndexError):
-                # Skip lines that don't match the expected format
-                continue
-    logger.debug(f"Raw latency metrics: {latency_metrics}")
-    # Log all collected percentiles
-    if latency_metrics:
-        logger.info(f"Latency metrics for {application_name}:")
-        # Sort percentiles numerically for better display
-        sorted_percentiles = sorted(latency_metrics.keys(), key=lambda x: float(x))
-        for p in sorted_percentiles:
-            logger.info(f"  {p}%: {latency_metrics[p]:.2f}ms")
-    if requests_per_sec is not None:
-        logger.info(f"Requests/sec: {requests_per_sec:.2f}")
+    # Prefer the raw percentile dump over the scraped text table when available
+    load_latency_file(latency_file, stats)
+    log_wrk_stats(application_name, stats)
     
-    # Return dict with latency_metrics, error_count, and requests_per_sec
-    return {
-        "latency_metrics": latency_metrics,
-        "error_count": error_count,
-        "requests_per_sec": requests_per_sec
-    }
+    # Results keep this driver's format: latency_metrics as sorted [percentile, ms] pairs
+    stats["latency_metrics"] = sorted(stats["latency_metrics"].items())
+    return stats
 
 def cleanup_all_resources():
     """Delete all Kubernetes resources in the current namespace."""
     logger.info("Cleaning up all resources using 'kubectl delete all --all'...")
     result = subprocess.run(
-        ["kubectl", "delete", "all", "--all"],
+        ["kubectl", "delete", "all", "--all", "--wait=true", "--timeout=60s"],
         capture_output=True,
         text=True
     )
@@ -300,14 +243,12 @@ def cleanup_all_resources():
             logger.warning(f"Error cleaning up resources: {result.stderr}")
     else:
         logger.info("Successfully cleaned up all resources")
-    # Wait a bit for resources to be deleted
-    time.sleep(15)
 
 def cleanup_manifest(manifest_path):
     """Delete the Kubernetes manifest."""
     logger.info(f"Cleaning up manifest: {manifest_path}")
     result = subprocess.run(
-        ["kubectl", "delete", "-f", manifest_path],
+        ["kubectl", "delete", "-f", manifest_path, "--wait=true", "--timeout=30s"],
         capture_output=True,
         text=True
     )
@@ -315,8 +256,6 @@ def cleanup_manifest(manifest_path):
         logger.warning(f"Error cleaning up manifest: {result.stderr}")
     else:
         logger.info(f"Successfully cleaned up: {manifest_path}")
-    # Wait a bit for resources to be deleted
-    time.sleep(5)
 
 def main():
     """Main function to run the benchmark."""
@@ -324,11 +263,10 @@ def main():
     args = parse_arguments()
     
     # Filter manifest_dict based on selected variants
-    selected_manifests = {}
-    for variant in args.variants:
-        key = f"kv-store-symphony-transport-{variant}"
-        if key in manifest_dict:
-            selected_manifests[key] = manifest_dict[key]
+    selected_manifests = {
+        f"kv-store-symphony-transport-{v}": manifest_dict[f"kv-store-symphony-transport-{v}"]
+        for v in args.variants
+    }
     
     # Validate all paths exist before starting
     if not validate_paths(selected_manifests):
@@ -354,6 +292,9 @@ def main():
     logger.info("-" * 40)
     logger.info("")
     
+    # Clear anything not carrying the benchmark=yes label; later deploys prune their predecessor
+    cleanup_all_resources()
+    
     # Iterate over each manifest
     for manifest_name, manifest_path in selected_manifests.items():
         logger.info("")
@@ -362,10 +303,7 @@ def main():
         logger.info("=" * 60)
         logger.info("")
         
-        # Step 0: Clean up all existing resources
-        cleanup_all_resources()
-        
-        # Step 1: Deploy the manifest
+        # Step 1: Deploy the manifest (prunes the previous variant's resources)
         if not deploy_manifest(manifest_path):
             logger.error(f"Failed to deploy {manifest_name}, skipping...")
             results[manifest_name] = {"status": "deployment_failed"}
@@ -374,14 +312,12 @@ def main():
         # Step 2: Wait for deployment to be ready
         if not wait_for_deployment_ready():
             logger.warning(f"Deployment for {manifest_name} did not become ready, skipping...")
-            cleanup_manifest(manifest_path)
             results[manifest_name] = {"status": "not_ready"}
             continue
         
         # Step 3: Test application health
         if not test_application():
             logger.warning(f"Application {manifest_name} is not healthy, skipping benchmark...")
-            cleanup_manifest(manifest_path)
             results[manifest_name] = {"status": "unhealthy"}
             continue
         
@@ -398,23 +334,22 @@ def main():
             logger.error(f"Benchmark failed: {wrk_result['error_count']} non-2xx or 3xx responses detected")
             results[manifest_name] = {
                 "status": "failure",
-                "latency_metrics": wrk_result.get("latency_metrics", {}),
+                "latency_metrics": wrk_result.get("latency_metrics", []),
                 "error_count": wrk_result.get("error_count", 0),
                 "requests_per_sec": wrk_result.get("requests_per_sec"),
             }
         else:
             results[manifest_name] = {
                 "status": "success",
-                "latency_metrics": wrk_result.get("latency_metrics", {}),
+                "latency_metrics": wrk_result.get("latency_metrics", []),
                 "error_count": wrk_result.get("error_count", 0),
                 "requests_per_sec": wrk_result.get("requests_per_sec"),
             }
-        
-        # Step 6: Cleanup
-        cleanup_manifest(manifest_path)
-        
-        # Wait a bit before next deployment
-        time.sleep(5)
+    
+    # The next deploy prunes each variant, so only the last one needs an explicit cleanup
+    if selected_manifests:
+        last_path = next(reversed(selected_manifests.values()))
+        cleanup_manifest(last_path)
     
     # Log summary of results
     logger.info("")
@@ -423,43 +358,34 @@ def main():
     logger.info("=" * 60)
     logger.info("")
     for manifest_name, result in results.items():
-        logger.info(f"{manifest_name}:")
+        # Build each variant's block up front and emit it with a single log call
+        lines = [f"{manifest_name}:"]
         status = result.get("status")
-        if status == "success":
-            latency = result.get("latency_metrics", {})
+        level = logging.INFO
+        if status in ("success", "failure"):
+            latency = result.get("latency_metrics", [])
             requests_per_sec = result.get("requests_per_sec")
+            if status == "failure":
+                level = logging.ERROR
+                lines.append(f"  Status: {status}")
+                lines.append(f"  Non-2xx or 3xx responses: {result.get('error_count', 0)}")
             if requests_per_sec is not None:
-                logger.info(f"  Requests/sec: {requests_per_sec:.2f}")
+                lines.append(f"  Requests/sec: {requests_per_sec:.2f}")
             if latency:
-                logger.info(f"  Latency metrics:")
-                # Sort percentiles numerically for better display
-                sorted_percentiles = sorted(latency.keys(), key=lambda x: float(x))
-                for p in sorted_percentiles:
-                    logger.info(f"    {p}%: {latency[p]:.2f}ms")
-            logger.info(f"  Status: {status}")
-        elif status == "failure":
-            latency = result.get("latency_metrics", {})
-            error_count = result.get("error_count", 0)
-            requests_per_sec = result.get("requests_per_sec")
-            logger.error(f"  Status: {status}")
-            logger.error(f"  Non-2xx or 3xx responses: {error_count}")
-            if requests_per_sec is not None:
-                logger.info(f"  Requests/sec: {requests_per_sec:.2f}")
-            if latency:
-                logger.info(f"  Latency metrics:")
-                # Sort percentiles numerically for better display
-                sorted_percentiles = sorted(latency.keys(), key=lambda x: float(x))
-                for p in sorted_percentiles:
-                    logger.info(f"    {p}%: {latency[p]:.2f}ms")
+                lines.append("  Latency metrics:")
+                lines.extend(f"    {p:g}%: {ms:.2f}ms" for p, ms in latency)
+            if status == "success":
+                lines.append(f"  Status: {status}")
         else:
-            logger.info(f"  Status: {status}")
-        logger.info("")
+            lines.append(f"  Status: {status}")
+        lines.append("")
+        logger.log(level, "\n".join(lines))
     
     # Optionally save results to a file
     results_filename = f"logs/benchmark_transport_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     with open(results_filename, "w") as f:
         json.dump(results, f, indent=2)
-    logger.info(f"Results saved to {results_filename}")
+    logger.info("Results saved to %s", results_filename)
 
 if __name__ == "__main__":
     main()
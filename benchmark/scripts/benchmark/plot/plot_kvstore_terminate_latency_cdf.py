@@ -12,6 +12,7 @@ Prerequisites:
     - Python 3.x
     - matplotlib
     - numpy
+    - pyarrow (optional, speeds up loading very large files)
 
 Input Files:
     The script expects latency data files in the 'logs/' directory:
@@ -25,10 +26,12 @@ Output:
       comparing gRPC and gRPC-istio latencies.
 """
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 import matplotlib.pyplot as plt
 import numpy as np
 import matplotlib
 import os
+import re
 
 # --- Global Style Settings ---
 matplotlib.rcParams['pdf.fonttype'] = 42
@@ -45,23 +48,48 @@ SYSTEMS = {
     "gRPC": "kv-store-grpc_latency.txt",
     "gRPC+Envoy": "kv-store-grpc-istio_latency.txt",
 }
-
-def load_timings(filename):
+SYSTEM_PATHS = {label: os.path.join(LOGS_DIR, fn) for label, fn in SYSTEMS.items()}
+
+# Curves with more samples than this are rasterized in the output PDF
+RASTERIZE_THRESHOLD = 50000
+
+# Files above this size are parsed with pyarrow's multithreaded CSV reader when available
+LARGE_FILE_BYTES = 32 * 1024 * 1024
+
+def _load_timings_arrow(filepath):
+    """Parse a large timing file via a memory-mapped pyarrow CSV read, or return None."""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return None
+    try:
+        table = pacsv.read_csv(
+            pa.memory_map(filepath),
+            read_options=pacsv.ReadOptions(autogenerate_column_names=True),
+            convert_options=pacsv.ConvertOptions(column_types={"f0": pa.int64()}),
+        )
+    except pa.ArrowInvalid:
+        return None
+    return table.column(0).to_numpy()
+
+_TIMING_LINE_RE = re.compile(rb"^\s*([+-]?\d+)\s*$", re.M)
+
+def load_timings(filepath):
     """Load timing data from a file in nanoseconds."""
-    filepath = os.path.join(LOGS_DIR, filename)
-    timings = []
-    
-    with open(filepath, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                try:
-                    ns = int(line)
-                    timings.append(ns)
-                except ValueError:
-                    continue
-    
-    return np.array(timings)
+    if os.path.getsize(filepath) > LARGE_FILE_BYTES:
+        timings = _load_timings_arrow(filepath)
+        if timings is not None:
+            return timings
+    try:
+        # Parse in C instead of calling int() per line
+        return np.loadtxt(filepath, dtype=np.int64, comments=None, ndmin=1)
+    except ValueError:
+        # Fallback for files with stray non-numeric lines: keep only lines
+        # holding a single (optionally signed) integer, as int(line) would
+        with open(filepath, "rb") as f:
+            data = f.read()
+        return np.array(_TIMING_LINE_RE.findall(data), dtype=np.int64)
 
 def plot_latency_cdf(data_dict, x_label="Latency (ns)", 
                      output_filename="latency_cdf.pdf", 
@@ -80,6 +108,9 @@ def plot_latency_cdf(data_dict, x_label="Latency (ns)",
     if system_order is None:
         system_order = list(data_dict.keys())
 
+    # Rasterize the curves for large inputs so the PDF does not carry one vertex per sample
+    rasterized = max(len(d) for d in data_dict.values()) > RASTERIZE_THRESHOLD
+
     # 2. Plot each system
     for i, system in enumerate(system_order):
         if system not in data_dict:
@@ -92,7 +123,8 @@ def plot_latency_cdf(data_dict, x_label="Latency (ns)",
                  label=system, 
                  color=colors[i % len(colors)], 
                  linestyle=linestyles[i % len(linestyles)], 
-                 linewidth=2.5)
+                 linewidth=2.5,
+                 rasterized=rasterized)
 
     # 3. Styling
     ax.set_yticks([0, 0.25, 0.50, 0.75, 1.0])
@@ -111,7 +143,7 @@ def plot_latency_cdf(data_dict, x_label="Latency (ns)",
     plt.tight_layout()
 
     print(f"Saving plot to {output_filename}...")
-    plt.savefig(output_filename, bbox_inches='tight')
+    plt.savefig(output_filename, bbox_inches='tight', dpi=200)
     plt.close()
     print(f"Saved plot to {output_filename}")
 
@@ -119,15 +151,21 @@ def main():
     parser = argparse.ArgumentParser(description='Plot CDF of kv-store latency')
     args = parser.parse_args()
     
-    # Load latency timings
-    latency_timings = {}
-    for label, filename in SYSTEMS.items():
-        filepath = os.path.join(LOGS_DIR, filename)
+    # Load latency timings (files are independent, so read them in parallel)
+    present_paths = {}
+    for label, filepath in SYSTEM_PATHS.items():
         if not os.path.exists(filepath):
             print(f"Warning: {filepath} not found, skipping {label}")
             continue
-        print(f"Loading {filename}...")
-        timings = load_timings(filename)
+        print(f"Loading {os.path.basename(filepath)}...")
+        present_paths[label] = filepath
+    
+    latency_timings = {}
+    with ThreadPoolExecutor(max_workers=max(len(present_paths), 1)) as executor:
+        futures = {label: executor.submit(load_timings, filepath)
+                   for label, filepath in present_paths.items()}
+    for label, future in futures.items():
+        timings = future.result()
         if len(timings) > 0:
             latency_timings[label] = timings
             print(f"  Loaded {len(timings)} samples")
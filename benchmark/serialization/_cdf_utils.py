@@ -0,0 +1,230 @@
+"""
+Shared loading and CDF plotting helpers for the serialization plotters
+(kv-store/plot_latency_cdf.py, kv-store/plot_size_cdf.py and
+online-boutique/plot_latency_cdf.py).
+
+numba is optional; when installed, it compiles the parser used for files
+with malformed lines.
+"""
+import io
+import json
+import os
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Number of log-spaced x positions sampled per CDF curve (roughly the plot width in pixels)
+CDF_GRID_POINTS = 1200
+
+# Read buffer for the profile files
+READ_BUFFER_BYTES = 1 << 20
+
+# Per-directory JSON index of summary statistics, keyed by file name
+STATS_CACHE_NAME = "_stats_cache.json"
+
+# Standard SIGCOMM Color Palette & Styles
+COLORS = ['#6acc64', '#4878d0', '#82c6e2', '#e6a04e', '#d65f5f']
+LINESTYLES = ['-', '--', '-.', ':', '-']
+
+def import_pyplot():
+    """Import pyplot with the shared style settings applied."""
+    # Import matplotlib only once there is data to plot; Agg skips GUI backend probing
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    # --- Global Style Settings ---
+    matplotlib.rcParams['pdf.fonttype'] = 42
+    matplotlib.rcParams['ps.fonttype'] = 42
+    matplotlib.rcParams.update({'font.size': 14})
+    return plt
+
+def _parse_int_lines_py(data):
+    """Parse one integer per line of data, skipping lines int() rejects."""
+    # Preallocated from the newline count rather than grown as a Python list
+    values = np.empty(data.count(b"\n") + 1, dtype=np.int64)
+    n = 0
+    for line in io.BytesIO(data):
+        try:
+            values[n] = int(line)
+        except ValueError:
+            continue
+        n += 1
+    return values[:n]
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _parse_int_lines_jit(buf):
+        """Compiled _parse_int_lines_py over a uint8 buffer: optional sign, digits, surrounding blanks."""
+        values = np.empty(np.count_nonzero(buf == 10) + 1, dtype=np.int64)
+        n = 0
+        # state: 0 leading blanks, 1 after sign, 2 digits, 3 trailing blanks, 4 rejected
+        state = 0
+        negative = False
+        value = 0
+        for c in buf:
+            if c == 10:
+                if state == 2 or state == 3:
+                    values[n] = -value if negative else value
+                    n += 1
+                state = 0
+                negative = False
+                value = 0
+            elif state == 4:
+                continue
+            elif c == 32 or c == 9 or c == 13:
+                if state == 2:
+                    state = 3
+                elif state == 1:
+                    state = 4
+            elif 48 <= c <= 57:
+                if state == 3:
+                    state = 4
+                else:
+                    value = value * 10 + (c - 48)
+                    state = 2
+            elif (c == 45 or c == 43) and state == 0:
+                negative = c == 45
+                state = 1
+            else:
+                state = 4
+        if state == 2 or state == 3:
+            values[n] = -value if negative else value
+            n += 1
+        return values[:n]
+
+def _parse_int_lines(data):
+    """Parse one integer per line, using the compiled parser when numba is installed."""
+    if numba is not None:
+        return _parse_int_lines_jit(np.frombuffer(data, dtype=np.uint8))
+    return _parse_int_lines_py(data)
+
+def _parse_int_file(filepath):
+    """Parse one integer per line, skipping anything that is not a number."""
+    if os.path.getsize(filepath) == 0:
+        return np.empty(0, dtype=np.int64)
+    # One binary handle with a large buffer: numpy's C parser pulls raw byte chunks,
+    # so no per-line str objects are created, and the fallback reuses the same handle
+    with open(filepath, "rb", buffering=READ_BUFFER_BYTES) as f:
+        try:
+            return np.loadtxt(f, dtype=np.int64, comments=None, ndmin=1)
+        except ValueError:
+            f.seek(0)
+            data = f.read()
+    # Fallback for files with stray non-numeric lines: skip them
+    return _parse_int_lines(data)
+
+def load_numeric_column(filepath):
+    """Load a one-integer-per-line file as a sorted int64 array."""
+    # Reuse the parsed, sorted array from the .npy sidecar while it is newer than the text file
+    cache = filepath + ".sorted.npy"
+    if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(filepath):
+        return np.load(cache, mmap_mode='r')
+    # Sort once here; the statistics and the CDF plot both read the sorted array
+    values = np.sort(_parse_int_file(filepath))
+    try:
+        np.save(cache, values)
+    except OSError as e:
+        print(f"  Warning: could not write cache {cache}: {e}")
+    return values
+
+def thin_cdf(sorted_data, yvals, grid_points=CDF_GRID_POINTS):
+    """Keep the samples bracketing each point of a log-spaced x grid, matching the log x-axis."""
+    n = len(sorted_data)
+    if n <= 2 * grid_points:
+        return sorted_data, yvals
+    lo = max(sorted_data[0], 1)
+    grid = np.geomspace(lo, max(sorted_data[-1], lo), grid_points)
+    # First sample at or above and last sample at or below each grid point, so
+    # vertical steps from repeated values keep both their bottom and top
+    idx = np.concatenate((
+        [0, n - 1],
+        np.searchsorted(sorted_data, grid, side='left'),
+        np.searchsorted(sorted_data, grid, side='right') - 1,
+    ))
+    idx = np.unique(np.clip(idx, 0, n - 1))
+    return sorted_data[idx], yvals[idx]
+
+def prepare_cdfs(data_dict, yvals_cache):
+    """Turn {system: sorted samples} into {system: (xs, ys)} ready to hand to ax.plot."""
+    curves = {}
+    for system, sorted_data in data_dict.items():
+        # CDF y-values depend only on the sample count, so share them between systems
+        n = len(sorted_data)
+        yvals = yvals_cache.get(n)
+        if yvals is None:
+            # float32 is ample for pixel placement and halves the bytes handed to matplotlib
+            yvals = yvals_cache[n] = np.arange(1, n + 1, dtype=np.float32) / np.float32(n)
+        curves[system] = thin_cdf(sorted_data, yvals)
+    return curves
+
+def plot_cdf_panel(ax, curves, system_order):
+    """Draw prepared CDF curves on ax with the shared colors, y-ticks and log x-axis."""
+    for i, system in enumerate(system_order):
+        if system not in curves:
+            continue
+
+        xs, ys = curves[system]
+
+        # Rasterize only the data lines; axes, ticks and labels stay vector in the PDF
+        ax.plot(xs, ys,
+                label=system,
+                color=COLORS[i % len(COLORS)],
+                linestyle=LINESTYLES[i % len(LINESTYLES)],
+                linewidth=2.5,
+                rasterized=True)
+
+    ax.set_yticks([0, 0.25, 0.50, 0.75, 1.0])
+    ax.set_yticklabels(['0', '25', '50', '75', '100'])
+
+    ax.set_xscale('log')
+    ax.grid(True, which="major", ls="-", alpha=0.3)
+
+def sorted_stats(sorted_data):
+    """Return (min, median, max) of a sorted array as plain lookups."""
+    n = len(sorted_data)
+    return sorted_data[0], (sorted_data[(n - 1) // 2] + sorted_data[n // 2]) / 2, sorted_data[-1]
+
+def load_stats_cache(directory):
+    """Load the statistics index for directory, or an empty one if it is missing or unreadable."""
+    try:
+        with open(os.path.join(directory, STATS_CACHE_NAME), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_stats_cache(directory, cache):
+    """Write the statistics index for directory, replacing the old one atomically."""
+    path = os.path.join(directory, STATS_CACHE_NAME)
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"  Warning: could not write stats cache {path}: {e}")
+
+def describe(filepath, sorted_data, cache):
+    """Return min/max/mean/median for filepath, reusing the cached entry while mtime and size match."""
+    st = os.stat(filepath)
+    key = os.path.basename(filepath)
+    entry = cache.get(key)
+    if entry and entry["mtime"] == st.st_mtime and entry["size"] == st.st_size:
+        return entry["stats"]
+    lo, med, hi = sorted_stats(sorted_data)
+    stats = {"min": float(lo), "max": float(hi), "mean": float(sorted_data.mean()), "median": float(med)}
+    cache[key] = {"mtime": st.st_mtime, "size": st.st_size, "stats": stats}
+    return stats
+
+def is_up_to_date(output_file, input_paths):
+    """True if output_file is newer than every existing input, this module included."""
+    if not os.path.exists(output_file):
+        return False
+    mtimes = [os.path.getmtime(p) for p in input_paths if os.path.exists(p)]
+    if not mtimes:
+        return False
+    return os.path.getmtime(output_file) > max(mtimes + [os.path.getmtime(__file__)])
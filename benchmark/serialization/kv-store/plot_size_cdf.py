@@ -36,6 +36,8 @@ Input Files:
         - symphony_hybrid_write_sizes.txt (if using --include-hybrid)
 
     Each file should contain one size value (in bytes) per line.
+    Parsed, sorted arrays are cached next to each file as <name>.txt.sorted.npy
+    and reused until the text file changes.
 
 Output:
     - serialization_size_cdf.pdf: A PDF file containing CDF plot
@@ -45,18 +47,20 @@ Output:
 
 Command-line Options:
     --include-hybrid    Include fRPC Hybrid format in the plot (default: False)
+    --force             Regenerate the PDF even if it is newer than all inputs
     --help, -h          Show this help message and exit
 """
 import argparse
-import matplotlib.pyplot as plt
-import numpy as np
-import matplotlib
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
-# --- Global Style Settings ---
-matplotlib.rcParams['pdf.fonttype'] = 42
-matplotlib.rcParams['ps.fonttype'] = 42
-matplotlib.rcParams.update({'font.size': 14})
+# Shared loader / CDF helpers live one directory up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _cdf_utils import (
+    describe, import_pyplot, is_up_to_date, load_numeric_column, load_stats_cache, plot_cdf_panel,
+    prepare_cdfs, save_stats_cache,
+)
 
 PROFILE_DATA_DIR = "profile_data"
 OUTPUT_FILE_BASE = "kv_store_serialization_size_cdf.pdf"
@@ -77,20 +81,7 @@ HYBRID_FORMAT = {
 
 def load_sizes(filename):
     """Load size data from a file in bytes."""
-    filepath = os.path.join(PROFILE_DATA_DIR, filename)
-    sizes = []
-    
-    with open(filepath, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                try:
-                    bytes_val = int(line)
-                    sizes.append(bytes_val)
-                except ValueError:
-                    continue
-    
-    return np.array(sizes)
+    return load_numeric_column(os.path.join(PROFILE_DATA_DIR, filename))
 
 def plot_size_cdf(data_dict, 
                   x_label='Message Size (bytes)', 
@@ -98,41 +89,23 @@ def plot_size_cdf(data_dict,
                   system_order=None):
     """
     Plots a CDF of message sizes with shared legend at bottom.
+    data_dict maps each system to its (xs, ys) curve from prepare_cdfs.
     """
     
+    plt = import_pyplot()
+    
     # 1. Setup Figure (single plot)
     fig, ax = plt.subplots(1, 1, figsize=(6, 4))
     
-    # Standard SIGCOMM Color Palette & Styles
-    colors = ['#6acc64', '#4878d0', '#82c6e2', '#e6a04e', '#d65f5f'] 
-    linestyles = ['-', '--', '-.', ':', '-']
-    
     if system_order is None:
         system_order = list(data_dict.keys())
 
     # 2. Plot each system
-    for i, system in enumerate(system_order):
-        if system not in data_dict:
-            continue
-        
-        sorted_data = np.sort(data_dict[system])
-        yvals = np.arange(1, len(sorted_data) + 1) / len(sorted_data)
-        
-        ax.plot(sorted_data, yvals, 
-                 label=system, 
-                 color=colors[i % len(colors)], 
-                 linestyle=linestyles[i % len(linestyles)], 
-                 linewidth=2.5)
+    plot_cdf_panel(ax, data_dict, system_order)
 
     # 3. Styling
-    ax.set_yticks([0, 0.25, 0.50, 0.75, 1.0])
-    ax.set_yticklabels(['0', '25', '50', '75', '100'])
-    
     ax.set_ylabel('CDF (%)', fontsize=14)
     ax.set_xlabel(x_label, fontsize=14)
-    
-    ax.set_xscale('log')
-    ax.grid(True, which="major", ls="-", alpha=0.3)
 
     # 4. Shared Legend at Bottom
     handles, labels = ax.get_legend_handles_labels()
@@ -152,7 +125,7 @@ def plot_size_cdf(data_dict,
     plt.subplots_adjust(bottom=0.25) 
 
     print(f"Saving plot to {output_filename}...")
-    plt.savefig(output_filename, bbox_inches='tight')
+    plt.savefig(output_filename, bbox_inches='tight', dpi=200)
     plt.close()
     print(f"Saved plot to {output_filename}")
 
@@ -160,6 +133,8 @@ def main():
     parser = argparse.ArgumentParser(description='Plot CDF of serialization message sizes')
     parser.add_argument('--include-hybrid', action='store_true',
                         help='Include fRPC Hybrid in the plot (default: False)')
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate the PDF even if it is newer than all inputs')
     args = parser.parse_args()
     
     # Build FORMATS dict based on flag
@@ -170,22 +145,43 @@ def main():
     # Determine output filename based on whether hybrid is included
     output_file = OUTPUT_FILE_HYBRID if args.include_hybrid else OUTPUT_FILE_BASE
     
+    # Summary statistics are reused from the JSON index while the input files are unchanged
+    stats_cache = load_stats_cache(PROFILE_DATA_DIR)
+    
+    # Input files for this run
+    filenames = [f"{prefix}_{op}_sizes.txt" for op in ("write",) for prefix in FORMATS.values()]
+    
+    # Nothing to do if the PDF is newer than every input file and this script
+    inputs = [os.path.join(PROFILE_DATA_DIR, f) for f in filenames] + [os.path.abspath(__file__)]
+    if not args.force and is_up_to_date(output_file, inputs):
+        print(f"{output_file} is up to date")
+        return
+    
+    # Read and parse every input file concurrently; results are reported in order below
+    with ThreadPoolExecutor(max_workers=len(filenames)) as pool:
+        loads = {filename: pool.submit(load_sizes, filename) for filename in filenames}
+    
     # Load write sizes
     write_sizes = {}
     for label, prefix in FORMATS.items():
         filename = f"{prefix}_write_sizes.txt"
         print(f"Loading {filename}...")
-        sizes = load_sizes(filename)
+        sizes = loads[filename].result()
         if len(sizes) > 0:
             write_sizes[label] = sizes
             print(f"  Loaded {len(sizes)} samples")
-            print(f"  Statistics: min={sizes.min()} bytes, max={sizes.max()} bytes, "
-                  f"mean={sizes.mean():.2f} bytes, median={np.median(sizes):.2f} bytes")
+            stats = describe(os.path.join(PROFILE_DATA_DIR, filename), sizes, stats_cache)
+            print(f"  Statistics: min={stats['min']:.0f} bytes, max={stats['max']:.0f} bytes, "
+                  f"mean={stats['mean']:.2f} bytes, median={stats['median']:.2f} bytes")
+    
+    save_stats_cache(PROFILE_DATA_DIR, stats_cache)
     
     # Plot CDF
     if write_sizes:
         system_order = list(FORMATS.keys())
-        plot_size_cdf(write_sizes,
+        # Sorting, y-values and thinning all happen up front; the plot function only draws
+        curves = prepare_cdfs(write_sizes, {})
+        plot_size_cdf(curves,
                      x_label='Message Size (bytes)',
                      output_filename=output_file,
                      system_order=system_order)
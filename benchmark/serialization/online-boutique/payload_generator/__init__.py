@@ -2,13 +2,14 @@
 
 from .config import Config
 from .field_generator import FieldGenerator
-from .message_generators import message_generators
+from .message_generators import batch_message_generators, message_generators
 from .dump_json import ensure_dir, write_jsonl, write_pretty_json_array
 
 __all__ = [
     "Config",
     "FieldGenerator",
     "message_generators",
+    "batch_message_generators",
     "ensure_dir",
     "write_jsonl",
     "write_pretty_json_array",
@@ -1,25 +1,108 @@
 """Utilities for writing generated payloads."""
 
+import gzip
 import json
 import os
-from typing import Any, Dict, List
+from typing import Any, BinaryIO, Dict, Iterable, Optional, Set, Tuple
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # second choice after orjson
+    msgspec = None
+
+try:
+    import zstandard
+except ImportError:  # only needed for compress="zst"
+    zstandard = None
+
+# Encoded bytes accumulated per write() call, and the file buffer size (writes at
+# least this large go straight to the OS without being copied through the buffer)
+WRITE_CHUNK_BYTES = 4 << 20
+WRITE_BUFFER_BYTES = 1 << 20
+
+# Reused msgspec encoder (holds its own output buffer between calls)
+_msgspec_encoder = msgspec.json.Encoder() if msgspec is not None else None
+
+
+# Directories ensure_dir() has already created in this process
+_ensured: Set[str] = set()
 
 
 def ensure_dir(path: str) -> None:
-    """Create directory if it doesn't exist."""
+    """Create directory if it doesn't exist; repeat calls for the same path skip the syscall."""
+    if path in _ensured:
+        return
     os.makedirs(path, exist_ok=True)
+    _ensured.add(path)
+
 
+def _encode_line(o: Dict[str, Any]) -> bytes:
+    """Encode one object as a compact UTF-8 JSON line."""
+    if orjson is not None:
+        # orjson encodes straight to compact UTF-8 bytes, newline included
+        return orjson.dumps(o, option=orjson.OPT_APPEND_NEWLINE)
+    if _msgspec_encoder is not None:
+        # Same compact, non-ASCII-escaped form as the stdlib branch below
+        return _msgspec_encoder.encode(o) + b"\n"
+    return json.dumps(o, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
 
-def write_jsonl(path: str, objs: List[Dict[str, Any]]) -> None:
-    """Write objects as JSONL (one JSON object per line)."""
-    with open(path, "w", encoding="utf-8") as f:
+
+def _open_output(path: str, compress: Optional[str]) -> Tuple[str, BinaryIO]:
+    """Open path for binary writing, optionally through gzip or zstd; returns the final path too."""
+    if compress is None:
+        return path, open(path, "wb", buffering=WRITE_BUFFER_BYTES)
+    if compress == "gz":
+        path += ".gz"
+        return path, gzip.open(path, "wb", compresslevel=1)
+    if compress == "zst":
+        if zstandard is None:
+            raise RuntimeError("compress='zst' requires the zstandard package")
+        path += ".zst"
+        return path, zstandard.ZstdCompressor(level=3).stream_writer(open(path, "wb"))
+    raise ValueError(f"Unknown compression: {compress!r} (expected None, 'gz' or 'zst')")
+
+
+def write_jsonl(path: str, objs: Iterable[Dict[str, Any]], compress: Optional[str] = None) -> str:
+    """Write objects as JSONL (one JSON object per line); objs may be a lazy iterator.
+
+    With compress="gz" or "zst" the stream is compressed inline and the matching
+    suffix is appended to path. Returns the path actually written.
+    """
+    # Accumulate encoded lines and hand them to the file in ~4 MiB chunks instead of per object
+    path, out = _open_output(path, compress)
+    with out as f:
+        buf = bytearray()
         for o in objs:
-            f.write(json.dumps(o, separators=(",", ":"), ensure_ascii=False))
-            f.write("\n")
+            buf += _encode_line(o)
+            if len(buf) >= WRITE_CHUNK_BYTES:
+                f.write(buf)
+                buf.clear()
+        if buf:
+            f.write(buf)
+    return path
 
 
-def write_pretty_json_array(path: str, objs: List[Dict[str, Any]]) -> None:
-    """Write objects as a pretty-printed JSON array."""
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(objs, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+def _encode_pretty(o: Dict[str, Any]) -> bytes:
+    """Encode one object as 2-space-indented UTF-8 JSON (no trailing newline)."""
+    if orjson is not None:
+        # orjson's OPT_INDENT_2 layout matches json.dumps(indent=2)
+        return orjson.dumps(o, option=orjson.OPT_INDENT_2)
+    return json.dumps(o, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def write_pretty_json_array(path: str, objs: Iterable[Dict[str, Any]]) -> None:
+    """Write objects as a pretty-printed JSON array; objs may be a lazy iterator."""
+    # Frame the array by hand so elements are encoded one at a time; the result is
+    # the same text json.dump(list(objs), indent=2) would produce
+    with open(path, "wb", buffering=WRITE_BUFFER_BYTES) as f:
+        sep = b"[\n  "
+        for o in objs:
+            f.write(sep)
+            f.write(_encode_pretty(o).replace(b"\n", b"\n  "))
+            sep = b",\n  "
+        f.write(b"[]\n" if sep.startswith(b"[") else b"\n]\n")
@@ -1,11 +1,40 @@
 """Field-level generators for creating realistic data."""
 
+import bisect
+import functools
+import itertools
 import random
 import string
 from datetime import datetime
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from config import Config
+from rng_utils import batch_choices, batch_indices
+
+_ALNUM = string.ascii_lowercase + string.digits
+_STREET_NAMES = ("Evergreen", "Main", "Oak", "Pine", "Maple", "Cedar", "Elm", "Sunset", "Park")
+_STREET_SUFFIXES = ("St", "Ave", "Rd", "Blvd", "Ln", "Dr")
+_DESC_TEMPLATES = (
+    "A high-quality {item} designed for everyday use.",
+    "A {adj} {item} made from durable {mat} materials.",
+    "This {item} combines comfort and style for modern living.",
+    "Built to last, this {item} is a practical addition to your home.",
+)
+_AD_URL_PREFIX = "https://ads.example.com/click?ad="
+
+
+@functools.lru_cache(maxsize=None)
+def _skewed_cum_weights(lo: int, hi: int, small_hi: int, p_small: float) -> Tuple[range, Tuple[float, ...]]:
+    """Population and cumulative weights with the same distribution as _skewed_len_small."""
+    split = min(small_hi, hi)
+    n_small = split - lo + 1
+    n_large = hi - max(lo, split + 1) + 1
+    if n_large <= 0:
+        p_small = 1.0
+    elif n_small <= 0:
+        p_small = 0.0
+    weights = [p_small / n_small if v <= split else (1.0 - p_small) / n_large for v in range(lo, hi + 1)]
+    return range(lo, hi + 1), tuple(itertools.accumulate(weights))
 
 
 class FieldGenerator:
@@ -14,22 +43,56 @@ class FieldGenerator:
     def __init__(self, cfg: Config):
         self.cfg = cfg
         self.rng = random.Random(cfg.seed)
+        self._getrandbits = self.rng.getrandbits
+        # URL prefix resolved once; gen_url only concatenates
+        self._picture_prefix = cfg.product_text.picture_base_url + "/"
+        # Read the clock once rather than per credit card
+        self._now_year = cfg.payment.base_year or datetime.utcnow().year
+
+        # Lowercased vocab, and each description template pre-filled with every item;
+        # templates that also take {adj}/{mat} keep those fields for a final format()
+        tcfg = cfg.product_text
+        self.items_lower = tuple(it.lower() for it in tcfg.items)
+        self.adjectives_lower = tuple(adj.lower() for adj in tcfg.adjectives)
+        self.materials_lower = tuple(mat.lower() for mat in tcfg.materials)
+        self._desc_by_item = tuple(
+            tuple(tmpl.format(item=it, adj="{adj}", mat="{mat}") for it in self.items_lower)
+            for tmpl in _DESC_TEMPLATES
+        )
+        self._desc_needs_fill = tuple("{adj}" in tmpl or "{mat}" in tmpl for tmpl in _DESC_TEMPLATES)
 
         # Small pools to make data "look real" without heavy cross-entity logic.
         self.user_ids = [self._gen_user_id() for _ in range(cfg.user_pool_size)]
         self.product_ids = [self._gen_product_id() for _ in range(cfg.product_pool_size)]
+        # Fixed pool sizes: the bit widths for gen_user_id/gen_product_id are computed once
+        self._user_bits = len(self.user_ids).bit_length()
+        self._product_bits = len(self.product_ids).bit_length()
+
+    def reseed(self, seed: int) -> None:
+        """Restart the random stream from seed; the ID pools are left as they are."""
+        self.rng.seed(seed)
 
     # ---- core random helpers ----
 
     def _hex(self, n: int) -> str:
-        return "".join(self.rng.choice("0123456789abcdef") for _ in range(n))
+        # Each hex digit is 4 random bits: one getrandbits call formatted in C
+        return format(self.rng.getrandbits(4 * n), f"0{n}x")
 
     def _alnum(self, n: int) -> str:
-        alphabet = string.ascii_lowercase + string.digits
-        return "".join(self.rng.choice(alphabet) for _ in range(n))
+        return "".join(batch_choices(_ALNUM, n, self.rng))
 
     def _choice(self, seq):
-        return seq[self.rng.randrange(len(seq))]
+        # Inlined randrange(len(seq)): CPython's _randbelow draws bit_length() bits and
+        # rejects values >= n, so this consumes the stream exactly as randrange would
+        n = len(seq)
+        if not n:
+            raise IndexError("Cannot choose from an empty sequence")
+        getrandbits = self._getrandbits
+        k = n.bit_length()
+        r = getrandbits(k)
+        while r >= n:
+            r = getrandbits(k)
+        return seq[r]
 
     def _randint(self, a: int, b: int) -> int:
         return self.rng.randint(a, b)
@@ -48,9 +111,26 @@ class FieldGenerator:
         """
         if lo >= hi:
             return lo
-        if self._randbool(p_small):
-            return self._randint(lo, min(small_hi, hi))
-        return self._randint(max(lo, min(small_hi, hi) + 1), hi)
+        # One random() bisected into the cached cumulative table over [lo, hi]
+        population, cum_weights = _skewed_cum_weights(lo, hi, small_hi, p_small)
+        return population[bisect.bisect(cum_weights, self.rng.random() * cum_weights[-1], 0, len(cum_weights) - 1)]
+
+    def _skewed_lens(self, lo: int, hi: int, small_hi: int, p_small: float, n: int) -> List[int]:
+        """n draws of _skewed_len_small in one weighted random.choices call."""
+        if lo >= hi:
+            return [lo] * n
+        population, cum_weights = _skewed_cum_weights(lo, hi, small_hi, p_small)
+        return self.rng.choices(population, cum_weights=cum_weights, k=n)
+
+    def _hex_n(self, width: int, n: int) -> List[str]:
+        """n hex strings of the given width, cut from a single bulk draw."""
+        s = self._hex(width * n)
+        return [s[i:i + width] for i in range(0, width * n, width)]
+
+    def _alnum_n(self, width: int, n: int) -> List[str]:
+        """n lowercase alphanumeric strings of the given width, cut from a single bulk draw."""
+        s = "".join(batch_choices(_ALNUM, width * n, self.rng))
+        return [s[i:i + width] for i in range(0, width * n, width)]
 
     # ---- ID generators ----
 
@@ -61,10 +141,30 @@ class FieldGenerator:
         return f"prod_{self._hex(8)}"
 
     def gen_user_id(self) -> str:
-        return self._choice(self.user_ids)
+        ids = self.user_ids
+        r = self._getrandbits(self._user_bits)
+        while r >= len(ids):
+            r = self._getrandbits(self._user_bits)
+        return ids[r]
 
     def gen_product_id(self) -> str:
-        return self._choice(self.product_ids)
+        ids = self.product_ids
+        r = self._getrandbits(self._product_bits)
+        while r >= len(ids):
+            r = self._getrandbits(self._product_bits)
+        return ids[r]
+
+    def gen_user_ids(self, n: int) -> List[str]:
+        return batch_choices(self.user_ids, n, self.rng)
+
+    def gen_product_ids(self, n: int) -> List[str]:
+        return batch_choices(self.product_ids, n, self.rng)
+
+    def gen_tracking_ids(self, n: int) -> List[str]:
+        return ["tracking_" + s for s in self._alnum_n(12, n)]
+
+    def gen_transaction_ids(self, n: int) -> List[str]:
+        return ["transaction_" + s for s in self._hex_n(10, n)]
 
     def gen_order_id(self) -> str:
         return f"order_{self._hex(10)}"
@@ -79,9 +179,14 @@ class FieldGenerator:
 
     def gen_quantity(self) -> int:
         qcfg = self.cfg.qty
-        if self._randbool(qcfg.small_quantity_prob):
-            return self._randint(qcfg.quantity_min, min(qcfg.small_quantity_max, qcfg.quantity_max))
-        return self._randint(max(qcfg.small_quantity_max + 1, qcfg.quantity_min), qcfg.quantity_max)
+        return self._skewed_len_small(qcfg.quantity_min, qcfg.quantity_max,
+                                      qcfg.small_quantity_max, qcfg.small_quantity_prob)
+
+    def gen_quantities(self, n: int) -> List[int]:
+        """n draws of gen_quantity's distribution in one weighted call."""
+        qcfg = self.cfg.qty
+        return self._skewed_lens(qcfg.quantity_min, qcfg.quantity_max,
+                                 qcfg.small_quantity_max, qcfg.small_quantity_prob, n)
 
     def gen_email(self, user_id: Optional[str] = None) -> str:
         uid = user_id or self.gen_user_id()
@@ -90,17 +195,25 @@ class FieldGenerator:
     def gen_url(self, kind: str, token: Optional[str] = None) -> str:
         tok = token or self._alnum(10)
         if kind == "picture":
-            return f"{self.cfg.product_text.picture_base_url}/{tok}.jpg"
+            return self._picture_prefix + tok + ".jpg"
         if kind == "ad":
-            return f"https://ads.example.com/click?ad={tok}"
-        return f"https://example.com/{tok}"
+            return _AD_URL_PREFIX + tok
+        return "https://example.com/" + tok
+
+    def gen_currency_code(self) -> str:
+        """One currency code, drawn by MoneyConfig.currency_weights when those are set."""
+        mcfg = self.cfg.money
+        if mcfg.currency_weights is None:
+            return self._choice(mcfg.currencies)
+        return mcfg.pick_currency(self.rng)[0]
 
     def gen_money(self, currency_code: Optional[str] = None, units_range: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
         mcfg = self.cfg.money
-        code = currency_code or self._choice(mcfg.currencies)
+        code = currency_code or mcfg.pick_currency(self.rng)[0]
         lo, hi = units_range if units_range is not None else (mcfg.price_units_min, mcfg.price_units_max)
-        units_val = self._randint(lo, hi)
-        nanos_val = self._choice(mcfg.nanos_choices)
+        # randrange directly (randint only wraps it); nanos come from the packed int64 table
+        units_val = self.rng.randrange(lo, hi + 1)
+        nanos_val = mcfg.nanos_table[self.rng.randrange(len(mcfg.nanos_table))]
 
         # Keep it non-negative for benchmark simplicity.
         units_json: Any = str(units_val) if mcfg.units_as_string else units_val
@@ -111,18 +224,33 @@ class FieldGenerator:
             "nanos": nanos_val,
         }
 
+    def gen_amounts(self, n: int, currency_code: Optional[str] = None,
+                    units_range: Optional[Tuple[int, int]] = None) -> List[Dict[str, Any]]:
+        """n gen_money() results with one bulk draw per field."""
+        mcfg = self.cfg.money
+        codes = [currency_code] * n if currency_code else mcfg.pick_currency(self.rng, k=n)
+        lo, hi = units_range if units_range is not None else (mcfg.price_units_min, mcfg.price_units_max)
+        units = batch_choices(range(lo, hi + 1), n, self.rng)
+        if mcfg.units_as_string:
+            units = [str(u) for u in units]
+        nanos = batch_choices(mcfg.nanos_table, n, self.rng)
+        return [
+            {"currency_code": code, "units": units_val, "nanos": nanos_val}
+            for code, units_val, nanos_val in zip(codes, units, nanos)
+        ]
+
     def gen_usd_money(self, units_range: Tuple[int, int]) -> Dict[str, Any]:
         return self.gen_money(currency_code=self.cfg.money.default_usd_code, units_range=units_range)
 
     def gen_address(self) -> Dict[str, Any]:
         acfg = self.cfg.address
-        city, state = self._choice(acfg.city_state_pairs)
+        city, state = acfg.pick_city_state(self.rng)
 
         street_no = self._randint(10, 9999)
-        street_name = self._choice(("Evergreen", "Main", "Oak", "Pine", "Maple", "Cedar", "Elm", "Sunset", "Park"))
-        suffix = self._choice(("St", "Ave", "Rd", "Blvd", "Ln", "Dr"))
+        street_name = self._choice(_STREET_NAMES)
+        suffix = self._choice(_STREET_SUFFIXES)
 
-        zip_code = self._randint(acfg.zip_min, acfg.zip_max)
+        zip_code = self.rng.randrange(acfg.zip_min, acfg.zip_max + 1)
 
         return {
             "street_address": f"{street_no} {street_name} {suffix}",
@@ -132,20 +260,43 @@ class FieldGenerator:
             "zip_code": zip_code,
         }
 
+    def gen_addresses(self, n: int) -> List[Dict[str, Any]]:
+        """Generate n addresses with one bulk draw per field instead of per address."""
+        acfg = self.cfg.address
+        cities, states = acfg.columns()
+        # One index list drives both columns so each city keeps its state
+        locs = batch_indices(len(cities), n, self.rng)
+        street_nos = batch_choices(range(10, 10000), n, self.rng)
+        street_names = batch_choices(_STREET_NAMES, n, self.rng)
+        suffixes = batch_choices(_STREET_SUFFIXES, n, self.rng)
+        countries = batch_choices(acfg.countries, n, self.rng)
+        zip_codes = batch_choices(range(acfg.zip_min, acfg.zip_max + 1), n, self.rng)
+
+        return [
+            {
+                "street_address": f"{street_no} {street_name} {suffix}",
+                "city": cities[i],
+                "state": states[i],
+                "country": country,
+                "zip_code": zip_code,
+            }
+            for i, street_no, street_name, suffix, country, zip_code
+            in zip(locs, street_nos, street_names, suffixes, countries, zip_codes)
+        ]
+
     def gen_credit_card(self) -> Dict[str, Any]:
         pcfg = self.cfg.payment
-        prefix = self._choice(pcfg.card_prefixes)
-        # Fill to 16 digits (simple; not Luhn-valid unless you add that)
-        remaining = 16 - len(prefix)
-        number = prefix + "".join(self.rng.choice(string.digits) for _ in range(remaining))
+        prefix, _brand, pan_length = self._choice(pcfg.card_specs)
+        # Fill to the brand's PAN length (simple; not Luhn-valid unless you add that)
+        remaining = pan_length - len(prefix)
+        number = prefix + "".join(batch_choices(string.digits, remaining, self.rng))
 
-        now_year = datetime.utcnow().year
-        year = now_year + self._randint(pcfg.exp_years_ahead_min, pcfg.exp_years_ahead_max)
+        year = self._now_year + self._randint(pcfg.exp_years_ahead_min, pcfg.exp_years_ahead_max)
         month = self._randint(1, 12)
 
         return {
             "credit_card_number": number,
-            "credit_card_cvv": self._randint(pcfg.cvv_min, pcfg.cvv_max),
+            "credit_card_cvv": self.rng.randrange(pcfg.cvv_min, pcfg.cvv_max + 1),
             "credit_card_expiration_year": year,
             "credit_card_expiration_month": month,
         }
@@ -153,30 +304,25 @@ class FieldGenerator:
     def gen_product_text(self) -> Tuple[str, str]:
         tcfg = self.cfg.product_text
         name = f"{self._choice(tcfg.adjectives)} {self._choice(tcfg.materials)} {self._choice(tcfg.items)}"
-        desc_templates = (
-            "A high-quality {item} designed for everyday use.",
-            "A {adj} {item} made from durable {mat} materials.",
-            "This {item} combines comfort and style for modern living.",
-            "Built to last, this {item} is a practical addition to your home.",
-        )
-        tmpl = self._choice(desc_templates)
-        description = tmpl.format(
-            item=self._choice(tcfg.items).lower(),
-            adj=self._choice(tcfg.adjectives).lower(),
-            mat=self._choice(tcfg.materials).lower(),
-        )
+        # Same draws as formatting the template directly: template, item, adjective, material
+        t = self.rng.randrange(len(_DESC_TEMPLATES))
+        description = self._choice(self._desc_by_item[t])
+        adj = self._choice(self.adjectives_lower)
+        mat = self._choice(self.materials_lower)
+        if self._desc_needs_fill[t]:
+            description = description.format(adj=adj, mat=mat)
         # Add a short second sentence sometimes.
         if self._randbool(0.5):
             description += " Easy to maintain and thoughtfully crafted."
         return name, description
 
     def gen_search_query(self) -> str:
-        tcfg = self.cfg.product_text
+        choice = self._choice
+        randbool = self._randbool
         # 1–3 keywords from mixed vocab
-        terms = []
-        terms.append(self._choice(tcfg.items).lower())
-        if self._randbool(0.7):
-            terms.append(self._choice(tcfg.materials).lower())
-        if self._randbool(0.4):
-            terms.append(self._choice(tcfg.categories))
-        return " ".join(terms[: self._randint(1, min(3, len(terms)))])
+        terms = [choice(self.items_lower)]
+        if randbool(0.7):
+            terms.append(choice(self.materials_lower))
+        if randbool(0.4):
+            terms.append(choice(self.cfg.product_text.categories))
+        return " ".join(terms[: self._randint(1, len(terms))])
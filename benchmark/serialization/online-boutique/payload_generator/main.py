@@ -4,40 +4,87 @@ Online Boutique (.proto) JSON payload generator
 - Generates reasonable JSON payloads for each message type in the provided schema.
 - Outputs one file per message type (JSONL: one JSON object per line).
 - Keeps logic simple: field-level generators + message builders.
-- Deterministic with seed.
+- Deterministic with seed; each message type has its own derived stream, so the
+  files are generated in parallel worker processes.
 
 Configuration is in config.py.
 """
 
 import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List
 
 from config import Config
 from field_generator import FieldGenerator
-from message_generators import message_generators
+from message_generators import batch_message_generators, message_generators
 from dump_json import ensure_dir, write_jsonl, write_pretty_json_array
 
+# Payloads per call to a batch generator (the batched output depends on this size)
+BATCH_PAYLOADS = 4096
 
-def main() -> None:
-    cfg = Config()
+# Per-process generator, built once by the pool initializer
+_worker_gen = None
+
+
+def _type_seed(seed: int, msg_type: str) -> int:
+    """Stable per-message-type seed (str hash() is randomized per process)."""
+    return seed ^ zlib.crc32(msg_type.encode("utf-8"))
+
+
+def _batched(batch_fn: Callable[[FieldGenerator, int], List[Dict[str, Any]]],
+             g: FieldGenerator, count: int) -> Iterator[Dict[str, Any]]:
+    """Yield count payloads from batch_fn, BATCH_PAYLOADS per call."""
+    for start in range(0, count, BATCH_PAYLOADS):
+        yield from batch_fn(g, min(BATCH_PAYLOADS, count - start))
+
+
+def _init_worker(cfg: Config) -> None:
+    global _worker_gen
+    _worker_gen = FieldGenerator(cfg)
 
+
+def _write_message_type(msg_type: str, count: int) -> str:
+    g = _worker_gen
+    cfg = g.cfg
+    # Reseed per type so each file is reproducible regardless of which worker runs it
+    g.reseed(_type_seed(cfg.seed, msg_type))
+    gen_fn = message_generators[msg_type]
+    batch_fn = batch_message_generators.get(msg_type)
+
+    # Lazy: payloads are generated as they are written, so at most one batch is alive at a time
+    if batch_fn is not None:
+        payloads = _batched(batch_fn, g, count)
+    else:
+        payloads = (gen_fn(g) for _ in range(count))
+    out_path = os.path.join(cfg.output.out_dir, f"{msg_type}.jsonl" if not cfg.output.pretty else f"{msg_type}.json")
+
+    if cfg.output.pretty:
+        write_pretty_json_array(out_path, payloads)
+    else:
+        out_path = write_jsonl(out_path, payloads, compress=cfg.output.compress)
+    return out_path
+
+
+def run_all(cfg: Config) -> None:
+    """Generate every message type in parallel, one worker task per output file."""
     ensure_dir(cfg.output.out_dir)
-    g = FieldGenerator(cfg)
 
-    for msg_type, count in cfg.counts.items():
-        gen_fn = message_generators.get(msg_type)
-        if gen_fn is None:
+    for msg_type, _ in cfg.counts:
+        if msg_type not in message_generators:
             raise KeyError(f"No generator registered for message type: {msg_type}")
 
-        payloads = [gen_fn(g) for _ in range(count)]
-        out_path = os.path.join(cfg.output.out_dir, f"{msg_type}.jsonl" if not cfg.output.pretty else f"{msg_type}.json")
-
-        if cfg.output.pretty:
-            write_pretty_json_array(out_path, payloads)
-        else:
-            write_jsonl(out_path, payloads)
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker, initargs=(cfg,)) as pool:
+        # Submit the largest types first so a big file is not left running alone at the end;
+        # results are still reported in config order
+        futures = {msg_type: pool.submit(_write_message_type, msg_type, count)
+                   for msg_type, count in sorted(cfg.counts, key=lambda mc: mc[1], reverse=True)}
+        for msg_type, count in cfg.counts:
+            print(f"Wrote {count:>7} payloads -> {futures[msg_type].result()}")
 
-        print(f"Wrote {count:>7} payloads -> {out_path}")
 
+def main() -> None:
+    run_all(Config())
     print("Done.")
 
 
@@ -1,18 +1,35 @@
 """Message-level generators for creating JSON payloads."""
 
-from typing import Any, Callable, Dict
+import itertools
+from typing import Any, Callable, Dict, List
 
 from field_generator import FieldGenerator
+from rng_utils import batch_choices
+
+_AD_TEMPLATES = (
+    "Save 20% on {category} essentials",
+    "Limited-time deals on {item}",
+    "Upgrade your {category} setup today",
+    "New arrivals: {item} collection",
+)
 
 
 def gen_CartItem(g: FieldGenerator) -> Dict[str, Any]:
     return {"product_id": g.gen_product_id(), "quantity": g.gen_quantity()}
 
 
+def gen_CartItem_batch(g: FieldGenerator, n: int) -> List[Dict[str, Any]]:
+    return [{"product_id": pid, "quantity": qty} for pid, qty in zip(g.gen_product_ids(n), g.gen_quantities(n))]
+
+
 def gen_AddItemRequest(g: FieldGenerator) -> Dict[str, Any]:
     return {"user_id": g.gen_user_id(), "item": gen_CartItem(g)}
 
 
+def gen_AddItemRequest_batch(g: FieldGenerator, n: int) -> List[Dict[str, Any]]:
+    return [{"user_id": uid, "item": item} for uid, item in zip(g.gen_user_ids(n), gen_CartItem_batch(g, n))]
+
+
 def gen_EmptyCartRequest(g: FieldGenerator) -> Dict[str, Any]:
     return {"user_id": g.gen_user_id()}
 
@@ -21,6 +38,11 @@ def gen_GetCartRequest(g: FieldGenerator) -> Dict[str, Any]:
     return {"user_id": g.gen_user_id()}
 
 
+def gen_user_only_batch(g: FieldGenerator, n: int) -> List[Dict[str, Any]]:
+    # EmptyCartRequest, GetCartRequest and EmptyUser all carry just a user_id
+    return [{"user_id": uid} for uid in g.gen_user_ids(n)]
+
+
 def gen_Cart(g: FieldGenerator) -> Dict[str, Any]:
     dcfg = g.cfg.dist
     n = g._skewed_len_small(dcfg.cart_items_min, dcfg.cart_items_max, small_hi=3, p_small=0.75)
@@ -38,13 +60,32 @@ def gen_EmptyUser(g: FieldGenerator) -> Dict[str, Any]:
 def gen_ListRecommendationsRequest(g: FieldGenerator) -> Dict[str, Any]:
     dcfg = g.cfg.dist
     n = g._skewed_len_small(dcfg.rec_req_ids_min, dcfg.rec_req_ids_max, small_hi=5, p_small=0.8)
-    return {"user_id": g.gen_user_id(), "product_ids": [g.gen_product_id() for _ in range(n)]}
+    return {"user_id": g.gen_user_id(), "product_ids": batch_choices(g.product_ids, n, g.rng)}
+
+
+def _split_product_ids(g: FieldGenerator, lens: List[int]) -> List[List[str]]:
+    """Draw all product IDs for a batch at once and slice them into per-payload lists."""
+    flat = g.gen_product_ids(sum(lens))
+    bounds = list(itertools.accumulate(lens, initial=0))
+    return [flat[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def gen_ListRecommendationsRequest_batch(g: FieldGenerator, n: int) -> List[Dict[str, Any]]:
+    dcfg = g.cfg.dist
+    lens = g._skewed_lens(dcfg.rec_req_ids_min, dcfg.rec_req_ids_max, 5, 0.8, n)
+    return [{"user_id": uid, "product_ids": ids} for uid, ids in zip(g.gen_user_ids(n), _split_product_ids(g, lens))]
 
 
 def gen_ListRecommendationsResponse(g: FieldGenerator) -> Dict[str, Any]:
     dcfg = g.cfg.dist
     n = g._skewed_len_small(dcfg.rec_resp_ids_min, dcfg.rec_resp_ids_max, small_hi=5, p_small=0.8)
-    return {"product_ids": [g.gen_product_id() for _ in range(n)]}
+    return {"product_ids": batch_choices(g.product_ids, n, g.rng)}
+
+
+def gen_ListRecommendationsResponse_batch(g: FieldGenerator, n: int) -> List[Dict[str, Any]]:
+    dcfg = g.cfg.dist
+    lens = g._skewed_lens(dcfg.rec_resp_ids_min, dcfg.rec_resp_ids_max, 5, 0.8, n)
+    return [{"product_ids": ids} for ids in _split_product_ids(g, lens)]
 
 
 def gen_Money(g: FieldGenerator) -> Dict[str, Any]:
@@ -52,19 +93,25 @@ def gen_Money(g: FieldGenerator) -> Dict[str, Any]:
     return g.gen_money()
 
 
+def gen_Money_batch(g: FieldGenerator, n: int) -> List[Dict[str, Any]]:
+    return g.gen_amounts(n)
+
+
 def gen_Product(g: FieldGenerator) -> Dict[str, Any]:
-    tcfg = g.cfg.product_text
-    dcfg = g.cfg.dist
+    cfg = g.cfg
+    tcfg = cfg.product_text
+    dcfg = cfg.dist
+    mcfg = cfg.money
     pid = g.gen_product_id()
     name, description = g.gen_product_text()
     cat_n = g._bounded_len(dcfg.product_categories_min, dcfg.product_categories_max)
-    categories = [g._choice(tcfg.categories) for _ in range(cat_n)]
+    categories = batch_choices(tcfg.categories, cat_n, g.rng)
     return {
         "id": pid,
         "name": name,
         "description": description,
         "picture": g.gen_url("picture", token=pid),
-        "price_usd": g.gen_usd_money((g.cfg.money.price_units_min, g.cfg.money.price_units_max)),
+        "price_usd": g.gen_usd_money((mcfg.price_units_min, mcfg.price_units_max)),
         "categories": categories,
     }
 
@@ -79,6 +126,10 @@ def gen_GetProductRequest(g: FieldGenerator) -> Dict[str, Any]:
     return {"id": g.gen_product_id()}
 
 
+def gen_GetProductRequest_batch(g: FieldGenerator, n: int) -> List[Dict[str, Any]]:
+    return [{"id": pid} for pid in g.gen_product_ids(n)]
+
+
 def gen_SearchProductsRequest(g: FieldGenerator) -> Dict[str, Any]:
     return {"query": g.gen_search_query()}
 
@@ -93,6 +144,10 @@ def gen_Address(g: FieldGenerator) -> Dict[str, Any]:
     return g.gen_address()
 
 
+def gen_Address_batch(g: FieldGenerator, n: int) -> List[Dict[str, Any]]:
+    return g.gen_addresses(n)
+
+
 def gen_GetQuoteRequest(g: FieldGenerator) -> Dict[str, Any]:
     dcfg = g.cfg.dist
     n = g._skewed_len_small(dcfg.cart_items_min, dcfg.cart_items_max, small_hi=3, p_small=0.8)
@@ -100,7 +155,8 @@ def gen_GetQuoteRequest(g: FieldGenerator) -> Dict[str, Any]:
 
 
 def gen_GetQuoteResponse(g: FieldGenerator) -> Dict[str, Any]:
-    return {"cost_usd": g.gen_usd_money((g.cfg.money.shipping_units_min, g.cfg.money.shipping_units_max))}
+    mcfg = g.cfg.money
+    return {"cost_usd": g.gen_usd_money((mcfg.shipping_units_min, mcfg.shipping_units_max))}
 
 
 def gen_ShipOrderRequest(g: FieldGenerator) -> Dict[str, Any]:
@@ -113,20 +169,39 @@ def gen_ShipOrderResponse(g: FieldGenerator) -> Dict[str, Any]:
     return {"tracking_id": g.gen_tracking_id()}
 
 
+def gen_ShipOrderResponse_batch(g: FieldGenerator, n: int) -> List[Dict[str, Any]]:
+    return [{"tracking_id": tid} for tid in g.gen_tracking_ids(n)]
+
+
 def gen_GetSupportedCurrenciesResponse(g: FieldGenerator) -> Dict[str, Any]:
     mcfg = g.cfg.money
     # 3–min(10, len(currencies))
     n = g._bounded_len(3, min(10, len(mcfg.currencies)))
-    # choose unique
-    codes = list(mcfg.currencies)
-    g.rng.shuffle(codes)
-    return {"currency_codes": codes[:n]}
+    # choose unique: partial draw of n codes rather than shuffling a copy of all of them
+    return {"currency_codes": g.rng.sample(mcfg.currencies, n)}
 
 
 def gen_CurrencyConversionRequest(g: FieldGenerator) -> Dict[str, Any]:
     mcfg = g.cfg.money
-    from_code = g._choice(mcfg.currencies)
-    to_code = g._choice([c for c in mcfg.currencies if c != from_code] or mcfg.currencies)
+    codes = mcfg.currencies
+    n = len(codes)
+    if mcfg.currency_weights is not None:
+        from_code = g.gen_currency_code()
+        # Weighted pick among the other codes; fall back to from_code if none can be drawn
+        others = [(c, w) for c, w in zip(codes, mcfg.currency_weights) if c != from_code and w > 0]
+        if others:
+            to_code = g.rng.choices([c for c, _ in others], weights=[w for _, w in others])[0]
+        else:
+            to_code = from_code
+    else:
+        i = g.rng.randrange(n)
+        from_code = codes[i]
+        if n > 1:
+            # Pick among the other n - 1 codes by skipping over index i, without building a filtered list
+            j = g.rng.randrange(n - 1)
+            to_code = codes[j + 1 if j >= i else j]
+        else:
+            to_code = from_code
     from_amt = g.gen_money(currency_code=from_code, units_range=(mcfg.conversion_units_min, mcfg.conversion_units_max))
     return {"from": from_amt, "to_code": to_code, "user_id": g.gen_user_id()}
 
@@ -136,7 +211,7 @@ def gen_CreditCardInfo(g: FieldGenerator) -> Dict[str, Any]:
 
 
 def gen_ChargeRequest(g: FieldGenerator) -> Dict[str, Any]:
-    amt = g.gen_money(currency_code=g._choice(g.cfg.money.currencies), units_range=(1, 2000))
+    amt = g.gen_money(currency_code=g.gen_currency_code(), units_range=(1, 2000))
     return {"amount": amt, "credit_card": gen_CreditCardInfo(g)}
 
 
@@ -144,6 +219,10 @@ def gen_ChargeResponse(g: FieldGenerator) -> Dict[str, Any]:
     return {"transaction_id": g.gen_transaction_id()}
 
 
+def gen_ChargeResponse_batch(g: FieldGenerator, n: int) -> List[Dict[str, Any]]:
+    return [{"transaction_id": tid} for tid in g.gen_transaction_ids(n)]
+
+
 def gen_OrderItem(g: FieldGenerator) -> Dict[str, Any]:
     # Keep minimal: cost independent of quantity (reasonable enough for payload shape).
     return {
@@ -153,12 +232,14 @@ def gen_OrderItem(g: FieldGenerator) -> Dict[str, Any]:
 
 
 def gen_OrderResult(g: FieldGenerator) -> Dict[str, Any]:
-    dcfg = g.cfg.dist
+    cfg = g.cfg
+    dcfg = cfg.dist
+    mcfg = cfg.money
     n = g._skewed_len_small(dcfg.order_items_min, dcfg.order_items_max, small_hi=3, p_small=0.75)
     return {
         "order_id": g.gen_order_id(),
         "shipping_tracking_id": g.gen_tracking_id(),
-        "shipping_cost": g.gen_usd_money((g.cfg.money.shipping_units_min, g.cfg.money.shipping_units_max)),
+        "shipping_cost": g.gen_usd_money((mcfg.shipping_units_min, mcfg.shipping_units_max)),
         "shipping_address": gen_Address(g),
         "items": [gen_OrderItem(g) for _ in range(n)],
     }
@@ -173,7 +254,7 @@ def gen_PlaceOrderRequest(g: FieldGenerator) -> Dict[str, Any]:
     uid = g.gen_user_id()
     return {
         "user_id": uid,
-        "user_currency": g._choice(g.cfg.money.currencies),
+        "user_currency": g.gen_currency_code(),
         "address": gen_Address(g),
         "email": g.gen_email(uid),
         "credit_card": gen_CreditCardInfo(g),
@@ -185,28 +266,20 @@ def gen_PlaceOrderResponse(g: FieldGenerator) -> Dict[str, Any]:
 
 
 def gen_Ad(g: FieldGenerator) -> Dict[str, Any]:
-    templates = (
-        "Save 20% on {category} essentials",
-        "Limited-time deals on {item}",
-        "Upgrade your {category} setup today",
-        "New arrivals: {item} collection",
-    )
     tcfg = g.cfg.product_text
-    text = g._choice(templates).format(category=g._choice(tcfg.categories), item=g._choice(tcfg.items).lower())
+    text = g._choice(_AD_TEMPLATES).format(category=g._choice(tcfg.categories), item=g._choice(g.items_lower))
     return {"redirect_url": g.gen_url("ad"), "text": text}
 
 
 def gen_AdRequest(g: FieldGenerator) -> Dict[str, Any]:
     dcfg = g.cfg.dist
-    tcfg = g.cfg.product_text
     n = g._bounded_len(dcfg.ad_keys_min, dcfg.ad_keys_max)
-    # context keys from mixed vocab
-    keys = []
-    for _ in range(n):
-        if g._randbool(0.5):
-            keys.append(g._choice(tcfg.categories))
-        else:
-            keys.append(g._choice(tcfg.items).lower())
+    # context keys from mixed vocab; loop-invariant lookups bound once
+    categories = g.cfg.product_text.categories
+    items_lower = g.items_lower
+    choice = g._choice
+    randbool = g._randbool
+    keys = [choice(categories) if randbool(0.5) else choice(items_lower) for _ in range(n)]
     return {"user_id": g.gen_user_id(), "context_keys": keys}
 
 
@@ -260,3 +333,24 @@ message_generators: Dict[str, Callable[[FieldGenerator], Dict[str, Any]]] = {
     "AdResponse": gen_AdResponse,
     "Ad": gen_Ad,
 }
+
+
+# Message types that can also be generated n at a time, sampling each field in bulk
+batch_message_generators: Dict[str, Callable[[FieldGenerator, int], List[Dict[str, Any]]]] = {
+    "CartItem": gen_CartItem_batch,
+    "AddItemRequest": gen_AddItemRequest_batch,
+    "EmptyCartRequest": gen_user_only_batch,
+    "GetCartRequest": gen_user_only_batch,
+    "EmptyUser": gen_user_only_batch,
+
+    "ListRecommendationsRequest": gen_ListRecommendationsRequest_batch,
+    "ListRecommendationsResponse": gen_ListRecommendationsResponse_batch,
+
+    "Money": gen_Money_batch,
+    "GetProductRequest": gen_GetProductRequest_batch,
+
+    "Address": gen_Address_batch,
+    "ShipOrderResponse": gen_ShipOrderResponse_batch,
+
+    "ChargeResponse": gen_ChargeResponse_batch,
+}
@@ -0,0 +1,29 @@
+"""Bulk random-selection helpers for payload generation."""
+
+from typing import List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def batch_indices(size: int, n: int, rng) -> List[int]:
+    """Draw n indices in [0, size) (with replacement) in one bulk call.
+
+    rng may be a random.Random or a numpy.random.Generator; the numpy path draws
+    all indices in a single C-level call. Sharing one index list between parallel
+    columns (e.g. cities and states) keeps their rows paired.
+    """
+    if n <= 0:
+        return []
+    integers = getattr(rng, "integers", None)
+    if integers is not None:
+        # tolist() yields Python ints rather than numpy scalars
+        return integers(0, size, n).tolist()
+    return rng.choices(range(size), k=n)
+
+
+def batch_choices(pool: Sequence[T], n: int, rng) -> List[T]:
+    """Pick n items from pool (with replacement) in one bulk draw."""
+    if not hasattr(rng, "integers"):
+        # random.Random: choices() indexes the pool itself; same draws as batch_indices
+        return rng.choices(pool, k=n) if n > 0 else []
+    return [pool[i] for i in batch_indices(len(pool), n, rng)]
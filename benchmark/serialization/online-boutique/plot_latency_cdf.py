@@ -42,6 +42,8 @@ Input Files:
         - symphony_hybrid_read_times.txt (if using --include-hybrid)
 
     Each file should contain one timing value (in nanoseconds) per line.
+    Parsed, sorted arrays are cached next to each file as <name>.txt.sorted.npy
+    and reused until the text file changes.
 
 Output:
     - online_boutique_serialization_latency_cdf.pdf: A PDF file containing side-by-side CDF plots
@@ -51,18 +53,20 @@ Output:
 
 Command-line Options:
     --include-hybrid    Include fRPC Hybrid format in the plot (default: False)
+    --force             Regenerate the PDF even if it is newer than all inputs
     --help, -h          Show this help message and exit
 """
 import argparse
-import matplotlib.pyplot as plt
-import numpy as np
-import matplotlib
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
-# --- Global Style Settings ---
-matplotlib.rcParams['pdf.fonttype'] = 42
-matplotlib.rcParams['ps.fonttype'] = 42
-matplotlib.rcParams.update({'font.size': 14})
+# Shared loader / CDF helpers live one directory up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _cdf_utils import (
+    describe, import_pyplot, is_up_to_date, load_numeric_column, load_stats_cache, plot_cdf_panel,
+    prepare_cdfs, save_stats_cache,
+)
 
 PROFILE_DATA_DIR = "profile_data"
 OUTPUT_FILE_BASE = "online_boutique_serialization_latency_cdf.pdf"
@@ -83,20 +87,7 @@ HYBRID_FORMAT = {
 
 def load_timings(filename):
     """Load timing data from a file in nanoseconds."""
-    filepath = os.path.join(PROFILE_DATA_DIR, filename)
-    timings = []
-    
-    with open(filepath, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                try:
-                    ns = int(line)
-                    timings.append(ns)
-                except ValueError:
-                    continue
-    
-    return np.array(timings)
+    return load_numeric_column(os.path.join(PROFILE_DATA_DIR, filename))
 
 def plot_merged_latency_cdfs(data_left, data_right, 
                              x_labels=('Write Latency (ns)', 'Read Latency (ns)'), 
@@ -105,15 +96,14 @@ def plot_merged_latency_cdfs(data_left, data_right,
     """
     Plots two CDFs side-by-side with shared legend at bottom.
     Titles are removed; X-axis labels differentiate the plots.
+    data_left/data_right map each system to its (xs, ys) curve from prepare_cdfs.
     """
     
+    plt = import_pyplot()
+    
     # 1. Setup Figure (1 row, 2 columns)
     fig, axes = plt.subplots(1, 2, figsize=(8, 3))
     
-    # Standard SIGCOMM Color Palette & Styles
-    colors = ['#6acc64', '#4878d0', '#82c6e2', '#e6a04e', '#d65f5f'] 
-    linestyles = ['-', '--', '-.', ':', '-']
-    
     if system_order is None:
         system_order = list(data_left.keys())
 
@@ -121,33 +111,14 @@ def plot_merged_latency_cdfs(data_left, data_right,
 
     # 2. Loop through both subplots
     for idx, ax in enumerate(axes):
-        data_dict = datasets[idx]
-        
-        for i, system in enumerate(system_order):
-            if system not in data_dict:
-                continue
-            
-            sorted_data = np.sort(data_dict[system])
-            yvals = np.arange(1, len(sorted_data) + 1) / len(sorted_data)
-            
-            ax.plot(sorted_data, yvals, 
-                     label=system, 
-                     color=colors[i % len(colors)], 
-                     linestyle=linestyles[i % len(linestyles)], 
-                     linewidth=2.5)
+        plot_cdf_panel(ax, datasets[idx], system_order)
 
         # 3. Styling
-        ax.set_yticks([0, 0.25, 0.50, 0.75, 1.0])
-        ax.set_yticklabels(['0', '25', '50', '75', '100'])
-        
         # Y-label only on the left plot
         ax.set_ylabel('CDF (%)' if idx == 0 else "") 
         
         # TITLES REMOVED, X-LABELS CUSTOMIZED
         ax.set_xlabel(x_labels[idx], fontsize=14)
-        
-        ax.set_xscale('log')
-        ax.grid(True, which="major", ls="-", alpha=0.3)
 
     # 4. Shared Legend at Bottom
     handles, labels = axes[0].get_legend_handles_labels()
@@ -167,7 +138,7 @@ def plot_merged_latency_cdfs(data_left, data_right,
     plt.subplots_adjust(bottom=0.25) 
 
     print(f"Saving merged plot to {output_filename}...")
-    plt.savefig(output_filename, bbox_inches='tight')
+    plt.savefig(output_filename, bbox_inches='tight', dpi=200)
     plt.close()
     print(f"Saved merged plot to {output_filename}")
 
@@ -175,6 +146,8 @@ def main():
     parser = argparse.ArgumentParser(description='Plot CDF of serialization latency for Online Boutique benchmark')
     parser.add_argument('--include-hybrid', action='store_true',
                         help='Include fRPC Hybrid in the plot (default: False)')
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate the PDF even if it is newer than all inputs')
     args = parser.parse_args()
     
     # Build FORMATS dict based on flag
@@ -185,18 +158,35 @@ def main():
     # Determine output filename based on whether hybrid is included
     output_file = OUTPUT_FILE_HYBRID if args.include_hybrid else OUTPUT_FILE_BASE
     
+    # Summary statistics are reused from the JSON index while the input files are unchanged
+    stats_cache = load_stats_cache(PROFILE_DATA_DIR)
+    
+    # Input files for this run
+    filenames = [f"{prefix}_{op}_times.txt" for op in ("write", "read") for prefix in FORMATS.values()]
+    
+    # Nothing to do if the PDF is newer than every input file and this script
+    inputs = [os.path.join(PROFILE_DATA_DIR, f) for f in filenames] + [os.path.abspath(__file__)]
+    if not args.force and is_up_to_date(output_file, inputs):
+        print(f"{output_file} is up to date")
+        return
+    
+    # Read and parse every input file concurrently; results are reported in order below
+    with ThreadPoolExecutor(max_workers=len(filenames)) as pool:
+        loads = {filename: pool.submit(load_timings, filename) for filename in filenames}
+    
     # Load write timings
     write_timings = {}
     for label, prefix in FORMATS.items():
         filename = f"{prefix}_write_times.txt"
         print(f"Loading {filename}...")
         try:
-            timings = load_timings(filename)
+            timings = loads[filename].result()
             if len(timings) > 0:
                 write_timings[label] = timings
                 print(f"  Loaded {len(timings)} samples")
-                print(f"  Statistics: min={timings.min():.2f}ns, max={timings.max():.2f}ns, "
-                      f"mean={timings.mean():.2f}ns, median={np.median(timings):.2f}ns")
+                stats = describe(os.path.join(PROFILE_DATA_DIR, filename), timings, stats_cache)
+                print(f"  Statistics: min={stats['min']:.2f}ns, max={stats['max']:.2f}ns, "
+                      f"mean={stats['mean']:.2f}ns, median={stats['median']:.2f}ns")
         except FileNotFoundError:
             print(f"  Warning: {filename} not found, skipping...")
     
@@ -206,19 +196,27 @@ def main():
         filename = f"{prefix}_read_times.txt"
         print(f"Loading {filename}...")
         try:
-            timings = load_timings(filename)
+            timings = loads[filename].result()
             if len(timings) > 0:
                 read_timings[label] = timings
                 print(f"  Loaded {len(timings)} samples")
-                print(f"  Statistics: min={timings.min():.2f}ns, max={timings.max():.2f}ns, "
-                      f"mean={timings.mean():.2f}ns, median={np.median(timings):.2f}ns")
+                stats = describe(os.path.join(PROFILE_DATA_DIR, filename), timings, stats_cache)
+                print(f"  Statistics: min={stats['min']:.2f}ns, max={stats['max']:.2f}ns, "
+                      f"mean={stats['mean']:.2f}ns, median={stats['median']:.2f}ns")
         except FileNotFoundError:
             print(f"  Warning: {filename} not found, skipping...")
     
+    save_stats_cache(PROFILE_DATA_DIR, stats_cache)
+    
     # Plot merged CDFs
     if write_timings and read_timings:
         system_order = list(FORMATS.keys())
-        plot_merged_latency_cdfs(write_timings, read_timings,
+        # Sorting, y-values and thinning all happen up front; the plot function only draws.
+        # One y-value cache covers both sides, since read and write usually share a sample count
+        yvals_cache = {}
+        write_curves = prepare_cdfs(write_timings, yvals_cache)
+        read_curves = prepare_cdfs(read_timings, yvals_cache)
+        plot_merged_latency_cdfs(write_curves, read_curves,
                                 x_labels=('Write Latency (ns)', 'Read Latency (ns)'),
                                 output_filename=output_file,
                                 system_order=system_order)
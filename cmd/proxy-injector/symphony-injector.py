@@ -1,7 +1,16 @@
 import argparse
+import copy
+import os
+import re
 import sys
 import yaml
 
+# Prefer the libyaml C bindings; fall back to the pure-Python implementations
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
 # Label key to control injection
 INJECTION_LABEL = "symphony.appnet.io/inject"
 
@@ -20,38 +29,12 @@ mode_to_image = {
     }
 }
 
-def should_inject(metadata):
-    """
-    Determines whether to inject based on the symphony.appnet.io/inject label.
-    If label is explicitly set to "false", return False. Otherwise, inject.
-    """
-    labels = metadata.get("labels", {})
-    return labels.get(INJECTION_LABEL, "true").lower() != "false"
-
-def inject_proxy(pod_spec, mode, tls_config=None):
-    """
-    Injects Symphony proxy and iptables initContainer into the given pod spec.
-    
-    Args:
-        pod_spec: The Kubernetes pod spec to inject into
-        mode: The proxy mode (symphony, h2, tcp)
-        tls_config: Dict containing TLS configuration options:
-            - enabled: bool (TLS or mTLS enabled)
-            - mtls: bool (mutual TLS mode)
-            - cert_file: server cert path
-            - key_file: server key path
-            - ca_file: CA cert path
-            - client_cert_file: client cert path
-            - client_key_file: client key path
-            - skip_verify: bool
-            - secret_name: Kubernetes secret name
-    """
-    if "containers" not in pod_spec:
-        return
-
-    proxy_container = {
+# Container templates per mode, built once. inject_proxy deep-copies them so no two
+# documents share nested objects (yaml.dump_all would emit those as &anchors/*aliases)
+_PROXY_CONTAINER_TEMPLATES = {
+    mode: {
         "name": "symphony-proxy",
-        "image": mode_to_image[mode]["proxy"],
+        "image": images["proxy"],
         "command": ["/app/proxy"],
         "env": [
             {
@@ -64,6 +47,56 @@ def inject_proxy(pod_spec, mode, tls_config=None):
             "capabilities": {"add": ["NET_ADMIN", "NET_RAW"]}
         }
     }
+    for mode, images in mode_to_image.items()
+}
+
+_INIT_CONTAINER_TEMPLATES = {
+    mode: {
+        "name": "set-iptables",
+        "image": images["init-container"],
+        "command": ["/bin/sh", "-c", "bash /apply_symphony_iptables.sh"],
+        "securityContext": {
+            "runAsUser": 0,
+            "capabilities": {"add": ["NET_ADMIN"]}
+        }
+    }
+    for mode, images in mode_to_image.items()
+}
+
+# Top-level `kind:` of a raw document, sniffed from its first _KIND_SNIFF_CHARS characters
+_KIND_RE = re.compile(r"^kind:[ \t]*['\"]?([A-Za-z0-9]+)", re.MULTILINE)
+_KIND_SNIFF_CHARS = 2048
+
+# Document start ("---", alone or with inline content) and end ("...") marker lines
+_MARKER_RE = re.compile(r"---(?:[ \t]|$)")
+_END_MARKER_RE = re.compile(r"\.\.\.(?:[ \t]|$)")
+# Lines that may precede a "---" marker without starting a document: blanks, comments, %directives
+_HEADER_LINE_RE = re.compile(r"[ \t]*(?:#.*)?$|%")
+# Raw text that opens its own document (optional header, then "---"), and header carrying a directive
+_OPENS_DOCUMENT_RE = re.compile(r"(?:(?:[ \t]*(?:#.*)?|%.*)\n)*---(?:[ \t\n]|$)")
+_DIRECTIVE_HEADER_RE = re.compile(r"(?:[ \t]*(?:#.*)?\n)*%")
+
+_TLS_VOLUME_MOUNT = {
+    "name": "tls-certs",
+    "mountPath": "/app/certs",
+    "readOnly": True
+}
+
+def should_inject(metadata):
+    """
+    Determines whether to inject based on the symphony.appnet.io/inject label.
+    If label is explicitly set to "false", return False. Otherwise, inject.
+    """
+    value = (metadata.get("labels") or {}).get(INJECTION_LABEL)
+    # Unlabelled (the common case) skips building a lowercased copy
+    return value is None or value.lower() != "false"
+
+def build_proxy_container(mode, tls_config=None):
+    """
+    Builds the proxy container for a mode and TLS configuration. Both are fixed for a
+    whole run, so this is done once and each pod gets a deep copy of the result.
+    """
+    proxy_container = copy.deepcopy(_PROXY_CONTAINER_TEMPLATES[mode])
 
     # Add TLS arguments if enabled
     if tls_config and tls_config.get("enabled"):
@@ -93,57 +126,143 @@ def inject_proxy(pod_spec, mode, tls_config=None):
             proxy_container["args"] = args
         
         # Add volume mounts for TLS certificates
-        proxy_container["volumeMounts"] = [
-            {
-                "name": "tls-certs",
-                "mountPath": "/app/certs",
-                "readOnly": True
-            }
-        ]
-        
+        proxy_container["volumeMounts"] = [dict(_TLS_VOLUME_MOUNT)]
+
+    return proxy_container
+
+def inject_proxy(pod_spec, mode, tls_config=None, proxy_template=None):
+    """
+    Injects Symphony proxy and iptables initContainer into the given pod spec.
+    
+    Args:
+        pod_spec: The Kubernetes pod spec to inject into
+        mode: The proxy mode (symphony, h2, tcp)
+        tls_config: Dict containing TLS configuration options:
+            - enabled: bool (TLS or mTLS enabled)
+            - mtls: bool (mutual TLS mode)
+            - cert_file: server cert path
+            - key_file: server key path
+            - ca_file: CA cert path
+            - client_cert_file: client cert path
+            - client_key_file: client key path
+            - skip_verify: bool
+            - secret_name: Kubernetes secret name
+        proxy_template: build_proxy_container(mode, tls_config), if already built
+    """
+    if "containers" not in pod_spec:
+        return
+
+    if proxy_template is None:
+        proxy_template = build_proxy_container(mode, tls_config)
+    proxy_container = copy.deepcopy(proxy_template)
+
+    if tls_config and tls_config.get("enabled"):
         # Add volumes to pod spec if not already present
-        if "volumes" not in pod_spec:
-            pod_spec["volumes"] = []
+        volumes = pod_spec.setdefault("volumes", [])
         
-        # Check if tls-certs volume already exists
-        tls_volume_exists = any(v.get("name") == "tls-certs" for v in pod_spec["volumes"])
-        if not tls_volume_exists:
-            pod_spec["volumes"].append({
+        # Check if tls-certs volume already exists (one pass into a name set)
+        existing_volumes = {v.get("name") for v in volumes}
+        if "tls-certs" not in existing_volumes:
+            volumes.append({
                 "name": "tls-certs",
                 "secret": {
                     "secretName": tls_config.get("secret_name", "kvstore-tls-certs")
                 }
             })
 
-    init_container = {
-        "name": "set-iptables",
-        "image": mode_to_image[mode]["init-container"],
-        "command": ["/bin/sh", "-c", "bash /apply_symphony_iptables.sh"],
-        "securityContext": {
-            "runAsUser": 0,
-            "capabilities": {"add": ["NET_ADMIN"]}
-        }
-    }
+    init_container = copy.deepcopy(_INIT_CONTAINER_TEMPLATES[mode])
 
     pod_spec.setdefault("initContainers", []).append(init_container)
     pod_spec["containers"].append(proxy_container)
 
-def process_yaml(documents, mode, tls_config=None):
+def wants_injection(doc):
     """
-    Processes all YAML documents, injecting into Deployments unless excluded by label.
+    True for a Deployment document that is not opted out by label.
     """
+    return bool(doc) and doc.get("kind") == "Deployment" and should_inject(doc.get("metadata", {}))
+
+def process_yaml(documents, mode, tls_config=None, proxy_template=None):
+    """
+    Processes YAML documents lazily, injecting into Deployments unless excluded by label.
+    Every document is yielded back (modified or not) as soon as it has been handled.
+    """
+    if proxy_template is None:
+        proxy_template = build_proxy_container(mode, tls_config)
     for doc in documents:
-        if doc.get("kind") != "Deployment":
-            continue
+        if wants_injection(doc):
+            pod_spec = doc.get("spec", {}).get("template", {}).get("spec", {})
+            inject_proxy(pod_spec, mode, tls_config, proxy_template)
+        yield doc
 
-        metadata = doc.get("metadata", {})
-        if not should_inject(metadata):
-            continue
+def split_documents(lines):
+    """
+    Splits a stream of YAML lines into the raw text of each document. A document runs
+    from its "---" marker (or the stream start) up to the next marker or a "..." end line.
+    Blank, comment and %directive lines ahead of a marker stay with the document it opens,
+    so joining the pieces back together reproduces the input exactly.
+    """
+    buf = []
+    for line in lines:
+        if line.startswith("---") and _MARKER_RE.match(line):
+            if not all(_HEADER_LINE_RE.match(l) for l in buf):
+                yield "".join(buf)
+                buf = []
+            buf.append(line)
+        elif line.startswith("...") and _END_MARKER_RE.match(line):
+            buf.append(line)
+            yield "".join(buf)
+            buf = []
+        else:
+            buf.append(line)
+    if buf:
+        yield "".join(buf)
 
-        pod_spec = doc.get("spec", {}).get("template", {}).get("spec", {})
-        inject_proxy(pod_spec, mode, tls_config)
+def process_raw_documents(segments, mode, tls_config=None):
+    """
+    Yields the output text of each raw document. Only documents that actually get a
+    proxy injected are parsed, modified and dumped again; everything else (sniffed as
+    another kind, or a Deployment that opts out) is passed through verbatim.
+    If a document does not parse on its own, the rest of the stream is parsed, injected
+    and dumped as a whole instead.
+    """
+    proxy_template = build_proxy_container(mode, tls_config)
+    segments = iter(segments)
+    for text in segments:
+        m = _KIND_RE.search(text, 0, _KIND_SNIFF_CHARS)
+        if not m or m.group(1) == "Deployment":
+            # Deployment, or a kind the sniff can't classify: needs a full parse
+            try:
+                documents = [doc for doc in yaml.load_all(text, Loader=SafeLoader) if doc is not None]
+            except yaml.YAMLError:
+                rest = text + "".join(segments)
+                documents = yaml.load_all(rest, Loader=SafeLoader)
+                yield yaml.dump_all(process_yaml(documents, mode, tls_config, proxy_template),
+                                    Dumper=SafeDumper, sort_keys=False)
+                return
+            if any(wants_injection(doc) for doc in documents):
+                yield yaml.dump_all(process_yaml(documents, mode, tls_config, proxy_template),
+                                    Dumper=SafeDumper, sort_keys=False)
+                continue
+            if not text.strip():
+                continue
+        yield text if text.endswith("\n") else text + "\n"
 
-    return documents
+def write_documents(outputs, out):
+    """
+    Writes document texts to out, adding the "---" (or, ahead of a %directive, "...")
+    separator that a text does not already open with.
+    """
+    prev = ""
+    for text in outputs:
+        if not text:
+            continue
+        if prev:
+            if not _OPENS_DOCUMENT_RE.match(text):
+                out.write("---\n")
+            elif _DIRECTIVE_HEADER_RE.match(text) and not _END_MARKER_RE.match(prev.rsplit("\n", 2)[-2]):
+                out.write("...\n")
+        out.write(text)
+        prev = text
 
 def main():
     parser = argparse.ArgumentParser(description="Auto-inject Symphony proxy and init container into K8s manifests.")
@@ -172,9 +291,6 @@ def main():
     
     args = parser.parse_args()
 
-    with open(args.file) if args.file else sys.stdin as f:
-        documents = list(yaml.safe_load_all(f))
-
     # Build TLS configuration
     tls_config = None
     if args.tls or args.mtls:
@@ -190,13 +306,16 @@ def main():
             "secret_name": args.tls_secret_name
         }
 
-    modified_documents = process_yaml(documents, args.mode, tls_config)
-    
-    if args.output:
-        with open(args.output, "w") as out:
-            yaml.dump_all(modified_documents, out, sort_keys=False)
-    else:
-        yaml.dump_all(modified_documents, sys.stdout, sort_keys=False)
+    with open(args.file) if args.file else sys.stdin as f:
+        # Stream: each document is split off, handled and written before the next is read
+        lines = f
+        if args.file and args.output and os.path.realpath(args.file) == os.path.realpath(args.output):
+            # Rewriting the input in place: read it all before the output truncates it
+            lines = f.readlines()
+        outputs = process_raw_documents(split_documents(lines), args.mode, tls_config)
+
+        with open(args.output, "w") if args.output else sys.stdout as out:
+            write_documents(outputs, out)
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,13 @@
 from bcc import BPF
 import ctypes
 import struct
+import sys
 
 MAX_DATA_LEN = 256
 TASK_COMM_LEN = 16
-UDP_PORT = 9000  # change to match your aRPC server port
+UDP_PORTS = (9000,)  # change to match your aRPC server port(s)
+PERF_PAGE_CNT = 256  # per-CPU perf ring size in pages (power of two)
+POLL_TIMEOUT_MS = 100
 
 bpf_text = f"""
 #include <uapi/linux/ptrace.h>
@@ -22,8 +25,10 @@ struct data_t {{
     char data[{MAX_DATA_LEN}];
 }};
 
-BPF_HASH(packet_count, u32, u64);
+BPF_PERCPU_ARRAY(packet_count, u64, 1);
 BPF_PERF_OUTPUT(events);
+// Destination ports to trace, filled in from Python; changing them needs no recompile
+BPF_HASH(port_watch, u16, u8);
 
 int trace_udp_sendmsg(struct pt_regs *ctx, struct sock *sk, struct msghdr *msg, size_t len) {{
     u16 sport = sk->__sk_common.skc_num;
@@ -46,12 +51,10 @@ int trace_udp_sendmsg(struct pt_regs *ctx, struct sock *sk, struct msghdr *msg,
         return 0;
     }}
     
-    if (dport != {UDP_PORT}) {{
+    if (!port_watch.lookup(&dport)) {{
         return 0;
     }}
     
-    bpf_trace_printk("traced udp_sendmsg for sport %d, dport %d\\n", sport, dport);
-    
     struct data_t data = {{0}};
     data.pid = bpf_get_current_pid_tgid() >> 32;
     data.dst_port = dport;
@@ -69,21 +72,28 @@ int trace_udp_sendmsg(struct pt_regs *ctx, struct sock *sk, struct msghdr *msg,
         return 0;
     }}
 
+    // Each CPU bumps its own slot, so no atomic or update call is needed
     u32 key = 0;
     u64 *count = packet_count.lookup(&key);
     if (count) (*count)++;
-    else {{
-        u64 init = 1;
-        packet_count.update(&key, &init);
-    }}
 
     events.perf_submit(ctx, &data, sizeof(data));
     return 0;
 }}
 """
 
-# Compile and attach
+# Compile once; the traced ports live in the port_watch map and can be changed at any time
 b = BPF(text=bpf_text)
+
+def watch_port(port):
+    b["port_watch"][ctypes.c_uint16(port)] = ctypes.c_uint8(1)
+
+def unwatch_port(port):
+    del b["port_watch"][ctypes.c_uint16(port)]
+
+for port in UDP_PORTS:
+    watch_port(port)
+
 b.attach_kprobe(event="udp_sendmsg", fn_name="trace_udp_sendmsg")
 
 # Define event structure
@@ -97,22 +107,40 @@ class Data(ctypes.Structure):
         ("data", ctypes.c_char * MAX_DATA_LEN),
     ]
 
+# Byte offset of the payload inside an event
+_DATA_OFFSET = Data.data.offset
+_event_at = Data.from_address
+
 # Print perf event
 def print_event(cpu, data, size):
-    event = ctypes.cast(data, ctypes.POINTER(Data)).contents
-    payload = bytes(event.data[:event.data_len])
-    print(f"\n[{event.task.decode()}] pid={event.pid} sent {event.data_len} bytes "
-          f"(src_port={event.src_port} -> dst_port={event.dst_port})")
-
-    print(f"  Raw payload (hex): {payload.hex()}")
+    # bcc hands over the event's address as an int; view it in place (valid for this callback)
+    event = _event_at(data)
+    # Slice the payload out of the event's own memory: no copy, and unlike the c_char
+    # field (read as NUL-terminated bytes) it keeps payloads that contain zero bytes
+    payload = memoryview(event).cast("B")[_DATA_OFFSET:_DATA_OFFSET + event.data_len]
+    # The whole report goes out in a single write
+    sys.stdout.write(f"\n[{event.task.decode()}] pid={event.pid} sent {event.data_len} bytes "
+                     f"(src_port={event.src_port} -> dst_port={event.dst_port})\n"
+                     f"  Raw payload (hex): {payload.hex()}\n")
+
+# Samples dropped because a CPU's ring was full
+lost_events = 0
+
+def on_lost(lost):
+    global lost_events
+    lost_events += lost
 
 # Start tracing
-b["events"].open_perf_buffer(print_event)
+# A larger ring and a blocking poll drain many events per wakeup
+b["events"].open_perf_buffer(print_event, page_cnt=PERF_PAGE_CNT, lost_cb=on_lost)
 
 
 print("Tracing UDP sendmsg... Ctrl+C to exit.")
 while True:
     try:
-        b.perf_buffer_poll()
+        b.perf_buffer_poll(timeout=POLL_TIMEOUT_MS)
     except KeyboardInterrupt:
+        print(f"\nTraced {b['packet_count'].sum(ctypes.c_int(0)).value} packets")
+        if lost_events:
+            print(f"Lost {lost_events} events (raise PERF_PAGE_CNT if this grows)")
         exit()
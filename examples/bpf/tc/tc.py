@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 
 from bcc import BPF
-from datetime import datetime
 import argparse
+import functools
+import signal
+import sys
+import threading
+import time
+from collections import deque
 from pyroute2 import IPRoute # python3.8 -m pip install "pyroute2<0.7.0"
 import socket
 import struct
@@ -11,8 +16,19 @@ import ctypes
 # Compile and load BPF program
 ipr = IPRoute()
 
+POLL_TIMEOUT_MS = 100
+EVENT_QUEUE_LEN = 100000  # events buffered between the ring buffer callback and the printer
+PRINT_RATE = 1000  # events decoded and printed per second; the rest are only counted
+
+_pack_u32 = struct.Struct("<I").pack
+
+# IP protocol numbers shown by name; anything else is printed as the number
+_PROTO = {1: 'ICMP', 6: 'TCP', 17: 'UDP'}
+
+# Traffic repeats a small set of endpoints, so most lookups are cache hits
+@functools.lru_cache(maxsize=4096)
 def print_ip(ip):
-    return socket.inet_ntoa(struct.pack("<I", ip))
+    return socket.inet_ntoa(_pack_u32(ip))
 
 class Data(ctypes.Structure):
     _fields_ = [
@@ -23,76 +39,93 @@ class Data(ctypes.Structure):
         ("protocol", ctypes.c_ubyte),
         ("payload", ctypes.c_ubyte * 64),
         ("payload_len", ctypes.c_uint32),
+        ("dropped", ctypes.c_ubyte),
     ]
 
+# Where the payload bytes sit inside an event, and how many there can be
+_PAYLOAD_OFFSET = Data.payload.offset
+_PAYLOAD_MAX = Data.payload.size
+
+# An event's raw bytes, for copying it out of the ring buffer in one memcpy
+_RawEvent = ctypes.c_char * ctypes.sizeof(Data)
+_raw_event_at = _RawEvent.from_address
+_copy_event = Data.from_buffer_copy
+
+# Frame fields are little-endian; unpack them in place with precompiled formats.
+# The fixed-size head of a frame (message_id, protocol_version, service_len) is one read.
+_HEADER = struct.Struct("<QIH")
+_HEADER_SIZE = _HEADER.size
+# Smallest possible frame: header, empty service, empty method (u16 length), message type (u32)
+_MIN_FRAME_SIZE = _HEADER_SIZE + 2 + 4
+_header = _HEADER.unpack_from
+_u32 = struct.Struct("<I").unpack_from
+_u16 = struct.Struct("<H").unpack_from
+
 def decode_rpc_frame(data):
+    """Decode an aRPC frame from any byte buffer (bytes, memoryview, ctypes array)."""
     try:
-        offset = 0
-        
-        # Message ID (8 bytes)
-        if len(data) < offset + 8:
-            return f"Too short for message_id (offset={offset}, len={len(data)})", {}
-        message_id = struct.unpack("<Q", data[offset:offset+8])[0]
-        offset += 8
+        # Walk a flat byte view of the frame so the field reads below don't copy the buffer
+        mv = memoryview(data).cast("B")
+        n = len(mv)
         
-        # Protocol version (4 bytes)
-        if len(data) < offset + 4:
-            return f"Too short for protocol_version (offset={offset}, len={len(data)})", {}
-        protocol_version = struct.unpack("<I", data[offset:offset+4])[0]
-        offset += 4
+        # Fixed header: message ID (8 bytes), protocol version (4 bytes), service name length (2 bytes)
+        if n < 8:
+            return f"Too short for message_id (offset=0, len={n})", {}
+        if n < 12:
+            return f"Too short for protocol_version (offset=8, len={n})", {}
+        if n < _HEADER_SIZE:
+            return f"Too short for service_len (offset=12, len={n})", {}
+        message_id, protocol_version, service_len = _header(mv, 0)
+        offset = _HEADER_SIZE
         
         # Service name
-        if len(data) < offset + 2:
-            return f"Too short for service_len (offset={offset}, len={len(data)})", {}
-        service_len = struct.unpack("<H", data[offset:offset+2])[0]
-        offset += 2
-        
-        if len(data) < offset + service_len:
-            return f"Too short for service (offset={offset}, service_len={service_len}, len={len(data)})", {}
-        service = data[offset:offset+service_len].decode("utf-8", errors="ignore")
+        if n < offset + service_len:
+            return f"Too short for service (offset={offset}, service_len={service_len}, len={n})", {}
+        service = str(mv[offset:offset+service_len], "utf-8", "ignore")
         offset += service_len
         
         # Method name
-        if len(data) < offset + 2:
-            return f"Too short for method_len (offset={offset}, len={len(data)})", {}
-        method_len = struct.unpack("<H", data[offset:offset+2])[0]
+        if n < offset + 2:
+            return f"Too short for method_len (offset={offset}, len={n})", {}
+        method_len = _u16(mv, offset)[0]
         offset += 2
         
-        if len(data) < offset + method_len:
-            return f"Too short for method (offset={offset}, method_len={method_len}, len={len(data)})", {}
-        method = data[offset:offset+method_len].decode("utf-8", errors="ignore")
+        if n < offset + method_len:
+            return f"Too short for method (offset={offset}, method_len={method_len}, len={n})", {}
+        method = str(mv[offset:offset+method_len], "utf-8", "ignore")
         offset += method_len
         
         # Message type
-        if len(data) < offset + 4:
-            return f"Too short for message_type (offset={offset}, len={len(data)})", {}
-        message_type = struct.unpack("<I", data[offset:offset+4])[0]
+        if n < offset + 4:
+            return f"Too short for message_type (offset={offset}, len={n})", {}
+        message_type = _u32(mv, offset)[0]
         offset += 4
         
         # Parameters
-        params = {}
-        while offset < len(data):
-            if len(data) < offset + 2:
+        # (name, value) pairs in frame order; the printer only iterates them
+        params = []
+        while offset < n:
+            if n < offset + 2:
                 break
-            param_len = struct.unpack("<H", data[offset:offset+2])[0]
+            param_len = _u16(mv, offset)[0]
             offset += 2
             
-            if len(data) < offset + param_len:
+            if n < offset + param_len:
                 break
-            param_name = data[offset:offset+param_len].decode("utf-8", errors="ignore")
+            param_name = str(mv[offset:offset+param_len], "utf-8", "ignore")
             offset += param_len
             
-            if len(data) < offset + 2:
+            if n < offset + 2:
                 break
-            value_len = struct.unpack("<H", data[offset:offset+2])[0]
+            value_len = _u16(mv, offset)[0]
             offset += 2
             
-            if len(data) < offset + value_len:
+            if n < offset + value_len:
                 break
-            param_value = data[offset:offset+value_len].decode("utf-8", errors="ignore")
+            param_value = str(mv[offset:offset+value_len], "utf-8", "ignore")
             offset += value_len
             
-            params[param_name] = param_value
+            params.append((param_name, param_value))
         
         return "OK", {
             "message_id": message_id,
@@ -107,36 +140,94 @@ def decode_rpc_frame(data):
         return f"Error: {e}", {}
 
 class EventHandler:
-    def process_event(self, cpu, data, size):
-        print(f"Processing event on CPU {cpu}")
-        event = ctypes.cast(data, ctypes.POINTER(Data)).contents
-        proto = 'TCP' if event.protocol == 6 else 'UDP' if event.protocol == 17 else str(event.protocol)
-        print(f"{datetime.now().strftime('%H:%M:%S')} | "
-              f"SRC: {print_ip(event.saddr):15} | "
-              f"DST: {print_ip(event.daddr):15} | "
-              f"SPORT: {event.sport:5} | "
-              f"DPORT: {event.dport:5} | "
-              f"PROTO: {proto}")
-        if event.payload_len > 0:
+    """
+    Keeps the ring buffer callback to a copy and an append; decoding and printing run on a
+    worker thread, so a slow terminal doesn't stall the poll loop into losing events.
+    """
+
+    def __init__(self, maxlen=EVENT_QUEUE_LEN):
+        self.queue = deque(maxlen=maxlen)
+        self.skipped = 0
+        # Events dropped because the printer fell a full queue behind
+        self.overflowed = 0
+        # Print budget for the current one-second window
+        self._budget = PRINT_RATE
+        self._window_start = time.monotonic()
+        # Formatted wall-clock second, rebuilt only when the second changes
+        self._last_sec = 0
+        self._last_ts = ""
+        self._ready = threading.Event()
+        threading.Thread(target=self._drain, daemon=True).start()
+
+    def on_event(self, ctx, data, size):
+        # bcc hands over the event's address as an int, valid only for this callback
+        if len(self.queue) == self.queue.maxlen:
+            # The append below evicts the oldest queued event
+            self.overflowed += 1
+        self.queue.append(_copy_event(_raw_event_at(data)))
+        self._ready.set()
+
+    def _drain(self):
+        while True:
+            self._ready.wait()
+            self._ready.clear()
+            while self.queue:
+                self.process_event(self.queue.popleft())
+            # One flush per drained batch (stdout is not line-buffered, see main)
+            sys.stdout.flush()
+
+    def process_event(self, event):
+        # Over the print rate, skip the decode too: its output would only be thrown away
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            self._window_start = now
+            self._budget = PRINT_RATE
+        if not self._budget:
+            self.skipped += 1
+            return
+        self._budget -= 1
+
+        # Collect the whole report and write it once
+        out = []
+        sec = int(time.time())
+        if sec != self._last_sec:
+            self._last_sec = sec
+            self._last_ts = time.strftime('%H:%M:%S', time.localtime(sec))
+        proto = _PROTO.get(event.protocol) or str(event.protocol)
+        out.append(f"{self._last_ts} | "
+                   f"SRC: {print_ip(event.saddr):15} | "
+                   f"DST: {print_ip(event.daddr):15} | "
+                   f"SPORT: {event.sport:5} | "
+                   f"DPORT: {event.dport:5} | "
+                   f"PROTO: {proto}"
+                   + (" | DROPPED" if event.dropped else ""))
+        if 0 < event.payload_len < _MIN_FRAME_SIZE:
+            # Too short to hold any RPC frame: skip the copy and the decode
+            out.append(f"Not an RPC frame ({event.payload_len} bytes)")
+        elif event.payload_len > 0:
             try:
-                payload = bytes(event.payload[:event.payload_len])
+                # Copy payload_len bytes (at most the array size) straight from the event's memory
+                payload = ctypes.string_at(ctypes.addressof(event) + _PAYLOAD_OFFSET,
+                                           min(event.payload_len, _PAYLOAD_MAX))
                 status, decoded = decode_rpc_frame(payload)
                 if status == "OK":
-                    print(f"RPC Message:")
-                    print(f"  Message ID: {decoded['message_id']}")
-                    print(f"  Service: {decoded['service']}")
-                    print(f"  Method: {decoded['method']}")
-                    print(f"  Message Type: {decoded['message_type']}")
-                    print(f"  Parameters:")
-                    for name, value in decoded['params'].items():
-                        print(f"    {name}: {value}")
+                    out.append("RPC Message:")
+                    out.append(f"  Message ID: {decoded['message_id']}")
+                    out.append(f"  Service: {decoded['service']}")
+                    out.append(f"  Method: {decoded['method']}")
+                    out.append(f"  Message Type: {decoded['message_type']}")
+                    out.append("  Parameters:")
+                    for name, value in decoded['params']:
+                        out.append(f"    {name}: {value}")
                 else:
-                    print(f"Decode Error: {status}")
-                    print(f"Raw Payload: {payload.hex()}")
+                    out.append(f"Decode Error: {status}")
+                    out.append(f"Raw Payload: {payload.hex()}")
             except Exception as e:
-                print(f"Error decoding payload: {e}")
-                print(f"Raw Payload: {payload.hex()}")
-        print("-" * 40)
+                out.append(f"Error decoding payload: {e}")
+                out.append(f"Raw Payload: {payload.hex()}")
+        out.append("-" * 40)
+        out.append("")
+        sys.stdout.write("\n".join(out))
 
 def main():
     parser = argparse.ArgumentParser(description="traffic monitor")
@@ -146,6 +237,7 @@ def main():
     b = BPF(src_file=f"{args.program}.c".encode(), debug=0)
 
     idx = None
+    handler = None
     try:
         ingress_fn = b.load_func("tc_ingress", BPF.SCHED_CLS)
         egress_fn = b.load_func("tc_egress", BPF.SCHED_CLS)
@@ -178,10 +270,34 @@ def main():
 
         print(f"BPF attached to {args.interface}. Press Ctrl+C to exit.")
         
+        # Programs that report packets (tc_drop) send them, drop verdict included,
+        # through the events ring buffer rather than the kernel trace pipe
+        try:
+            events = b["events"]
+        except KeyError:
+            events = None
+        if events is not None:
+            # Let reports pile up in stdout's buffer; the drain thread flushes per batch
+            sys.stdout.reconfigure(line_buffering=False)
+            handler = EventHandler()
+            # The ring is sized in the BPF program; a bounded blocking poll drains it in batches
+            events.open_ring_buffer(handler.on_event)
+            while True:
+                b.ring_buffer_poll(timeout=POLL_TIMEOUT_MS)
+
+        # Nothing to consume (tc_mutate): sleep until Ctrl+C instead of spinning a core
         while True:
-            pass
+            signal.pause()
 
     except KeyboardInterrupt:
+        if handler is not None:
+            lost = b["events_lost"][ctypes.c_int(0)].value
+            if lost:
+                print(f"Lost {lost} events (enlarge the events ring if this grows)")
+            if handler.overflowed:
+                print(f"Dropped {handler.overflowed} events from a full print queue ({EVENT_QUEUE_LEN})")
+            if handler.skipped:
+                print(f"Skipped printing {handler.skipped} events over {PRINT_RATE}/s")
         print("Detaching BPF program...")
     finally:
         if idx is not None:
@@ -14,7 +14,10 @@ typedef __u32 u32;
 typedef __u16 u16;
 typedef __u8 u8;
 
-BPF_PERF_OUTPUT(events);
+// One ring shared by all CPUs (kernel >= 5.8); size in pages, a power of two
+BPF_RINGBUF_OUTPUT(events, 64);
+// Events that did not fit in the ring
+BPF_ARRAY(events_lost, u64, 1);
 
 struct data_t {
     u32 saddr;
@@ -24,15 +27,14 @@ struct data_t {
     u8 protocol;
     u8 payload[MAX_PAYLOAD_LEN];
     u32 payload_len;
+    u8 dropped;
 };
 
 static __always_inline int payload_contains_bob(const char *s, int len) {
 #pragma unroll
     for (int i = 0; i < MAX_PAYLOAD_LEN - 3; i++) {
-        if (s[i] == 'B' && s[i+1] == 'o' && s[i+2] == 'b') {
-            bpf_trace_printk("Dropping packet with payload containing 'Bob' at offset %d\n", i);
+        if (s[i] == 'B' && s[i+1] == 'o' && s[i+2] == 'b')
             return 1;
-        }
     }
     return 0;
 }
@@ -80,15 +82,17 @@ static __always_inline int handle_packet(struct __sk_buff *skb) {
 
     __builtin_memcpy(new_data.payload, buf, MAX_PAYLOAD_LEN);
     new_data.payload_len = MAX_PAYLOAD_LEN;
-    events.perf_submit(skb, &new_data, sizeof(new_data));
 
-    // Do this last: check if we need to drop
-    bpf_trace_printk("Checking payload for 'Bob'\n");
-    if (payload_contains_bob(buf, MAX_PAYLOAD_LEN)) {
-        return TC_ACT_SHOT;  // Drop after emitting
+    // The drop verdict travels in the event; tc.py prints it with the packet
+    new_data.dropped = payload_contains_bob(buf, MAX_PAYLOAD_LEN);
+    if (events.ringbuf_output(&new_data, sizeof(new_data), 0) < 0) {
+        u32 key = 0;
+        u64 *lost = events_lost.lookup(&key);
+        if (lost)
+            __sync_fetch_and_add(lost, 1);
     }
 
-    return TC_ACT_OK;
+    return new_data.dropped ? TC_ACT_SHOT : TC_ACT_OK;
 }
 
 